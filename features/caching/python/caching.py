@@ -16,7 +16,13 @@ from pxr import Usd
 
 
 class StageTraversalWatcher(threading.Thread):
-    """A basic thread that prints cached Stage repeatedly."""
+    """A basic thread that prints cached Stage repeatedly.
+
+    Note:
+        For a reusable way to read many cached stages from many threads,
+        see `stage_reader_pool.ReaderPool`.
+
+    """
 
     def __init__(self, event, cache, stage_ids):
         """Save the given Stage information to this instance.
@@ -104,6 +110,10 @@ def threading_example():
     Reference:
         https://graphics.pixar.com/usd/docs/api/class_usd_stage_cache.html#af6d4a9d580fe05510b1a35087332166c
 
+    Note:
+        To write from many threads without starting one thread per-edit,
+        see `stage_writer.StageWriter`.
+
     """
 
     def create_prims(cache, stage_ids, index):
@@ -0,0 +1,434 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""A bounded, least-recently-used layer on top of the `pxr.UsdUtils.StageCache` singleton.
+
+`pxr.Usd.StageCache` keeps every stage that is added to it until the
+stage is erased or the cache is cleared. A long-running process that
+opens many stages will eventually run out of memory. This module tracks
+how recently each stage was used and erases the oldest stages once
+there are too many stages or once the stages take too much memory.
+
+Stages which are in use can be "pinned" so they are never erased.
+
+Example:
+    >>> import stage_cache_manager
+    >>> manager = stage_cache_manager.StageCacheManager(
+    ...     maximum_stages=20, maximum_memory=8 * 1024 ** 3
+    ... )
+    >>> stage_id = manager.open("/some/shot.usda")
+    >>> with manager.pin(stage_id) as stage:
+    ...     print(stage.GetPseudoRoot().GetChildren())
+    >>> manager.get_statistics()
+    {'hits': 0, 'misses': 1, 'evictions': 0, 'stages': 1, 'memory': 10485760, ...}
+
+"""
+
+# IMPORT STANDARD LIBRARIES
+import collections
+import contextlib
+import os
+import threading
+
+# IMPORT THIRD-PARTY LIBRARIES
+from pxr import Sdf, Usd, UsdUtils
+
+_BYTES_PER_PRIM = 2048
+
+
+def _get_prim_count(stage):
+    """int: Count every prim of some stage, using USD's stage statistics."""
+    statistics = UsdUtils.ComputeUsdStageStats(stage)
+
+    # Depending on the USD version, the stage overload returns (prim_count, statistics)
+    if isinstance(statistics, tuple):
+        return int(statistics[0])
+
+    prims = dict(statistics).get("totalPrimCount")
+
+    if prims is None:
+        return sum(1 for _ in stage.TraverseAll())
+
+    return int(prims)
+
+
+def estimate_memory(stage, bytes_per_prim=_BYTES_PER_PRIM):
+    """Guess how many bytes some stage uses, from its number of prims.
+
+    USD can't measure the memory of one stage. (The root layer path
+    overload of `pxr.UsdUtils.ComputeUsdStageStats` reports the memory
+    of the whole process). So every prim is assumed to cost `bytes_per_prim`.
+
+    Counting prims traverses the whole stage so this can be slow for
+    large stages.
+
+    Args:
+        stage (`pxr.Usd.Stage`): The stage to estimate.
+        bytes_per_prim (int, optional): The estimated memory of each prim.
+
+    Returns:
+        int: The estimated memory of `stage`, in bytes.
+
+    """
+    return int(_get_prim_count(stage) * bytes_per_prim)
+
+
+class StageCacheManager(object):
+    """Open, find and erase stages so that a stage cache never grows past some limit.
+
+    Only stages that are opened or inserted with this object are
+    tracked. Any other stage in the cache is left alone.
+
+    Every method is thread-safe.
+
+    """
+
+    def __init__(
+        self,
+        cache=None,
+        maximum_stages=None,
+        maximum_memory=None,
+        get_memory=estimate_memory,
+    ):
+        """Keep track of the cache to manage and its limits.
+
+        Args:
+            cache (`pxr.Usd.StageCache`, optional):
+                The cache to add stages into. If no cache is given, the
+                `pxr.UsdUtils.StageCache` singleton is used.
+            maximum_stages (int, optional):
+                The most stages which may be cached at once. If no
+                number is given, there is no limit.
+            maximum_memory (int, optional):
+                The most memory, in bytes, which cached stages may use.
+                If no number is given, there is no limit. By default, the
+                memory of each stage is estimated from its number of
+                prims. See :func:`estimate_memory`.
+            get_memory (callable[`pxr.Usd.Stage`] -> int, optional):
+                The function that estimates the memory of a newly cached
+                stage. It's called without holding any lock.
+
+        Raises:
+            ValueError: If `maximum_stages` or `maximum_memory` is less than 1.
+
+        """
+        super(StageCacheManager, self).__init__()
+
+        for name, value in (
+            ("maximum_stages", maximum_stages),
+            ("maximum_memory", maximum_memory),
+        ):
+            if value is not None and value < 1:
+                raise ValueError(
+                    '"{name}" must be at least 1, not "{value}".'.format(
+                        name=name, value=value
+                    )
+                )
+
+        self.cache = cache or UsdUtils.StageCache.Get()
+        self.maximum_stages = maximum_stages
+        self.maximum_memory = maximum_memory
+
+        self._get_memory = get_memory
+        self._lock = threading.RLock()
+        self._opening = {}  # Each path being opened, its lock and its waiting threads
+        self._memory = collections.OrderedDict()  # Oldest stages first
+        self._pins = collections.Counter()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def _add(self, stage, memory=0, pin=False):
+        """Track some cached stage and erase older stages, if needed.
+
+        Args:
+            stage (`pxr.Usd.Stage`): A stage which is in the cache.
+            memory (int, optional):
+                The estimated memory of `stage`, in bytes. It's only
+                used if `stage` isn't tracked yet.
+            pin (bool, optional):
+                If True, `stage` is pinned. Call :meth:`unpin` to release it.
+
+        Returns:
+            `pxr.Usd.StageCache.Id`: The key to `stage` in the cache.
+
+        """
+        stage_id = self.cache.GetId(stage)
+        key = stage_id.ToLongInt()
+
+        if pin:
+            self._pins[key] += 1
+
+        if key not in self._memory:
+            self._memory[key] = memory
+            self._evict(protected=key)
+
+        self._touch(key)
+
+        return stage_id
+
+    def _evict(self, protected=None):
+        """Erase the least-recently used stages until every limit is respected.
+
+        Pinned stages are never erased. If every stage is pinned, the
+        limits are exceeded until a stage is unpinned.
+
+        Args:
+            protected (int, optional): The key of a stage which must not be erased.
+
+        Returns:
+            list[`pxr.Usd.StageCache.Id`]: The key of every erased stage.
+
+        """
+        evicted = []
+
+        for key in list(self._memory):
+            if not self._is_over_limit():
+                break
+
+            if key == protected or self._pins[key]:
+                continue
+
+            stage_id = Usd.StageCache.Id.FromLongInt(key)
+            self.cache.Erase(stage_id)
+            del self._memory[key]
+            evicted.append(stage_id)
+
+        self._evictions += len(evicted)
+
+        return evicted
+
+    def _forget(self, key):
+        """Stop tracking a stage that's no longer in the cache."""
+        self._memory.pop(key, None)
+        self._pins.pop(key, None)
+
+    def _is_over_limit(self):
+        """bool: Check if too many stages are cached or if they use too much memory."""
+        if self.maximum_stages is not None and len(self._memory) > self.maximum_stages:
+            return True
+
+        return (
+            self.maximum_memory is not None
+            and sum(self._memory.values()) > self.maximum_memory
+        )
+
+    @contextlib.contextmanager
+    def _lock_path(self, path):
+        """Stop other threads from opening the same path until the context exits.
+
+        Each path's lock is removed once no thread is waiting for it so
+        a long-running process doesn't keep one lock per-path, forever.
+
+        Args:
+            path (str): The root layer of some stage.
+
+        """
+        key = os.path.normcase(os.path.normpath(os.path.abspath(path)))
+
+        with self._lock:
+            entry = self._opening.setdefault(key, [threading.Lock(), 0])
+            entry[1] += 1
+
+        try:
+            with entry[0]:
+                yield
+        finally:
+            with self._lock:
+                entry[1] -= 1
+
+                if not entry[1]:
+                    del self._opening[key]
+
+    def _touch(self, key):
+        """Mark some stage as the most-recently used stage."""
+        self._memory[key] = self._memory.pop(key)
+
+    def erase(self, stage_id):
+        """Remove some stage from the cache, even if it's pinned.
+
+        Args:
+            stage_id (`pxr.Usd.StageCache.Id`): The key of the stage to remove.
+
+        Returns:
+            bool: If the stage was in the cache.
+
+        """
+        with self._lock:
+            self._forget(stage_id.ToLongInt())
+
+            return self.cache.Erase(stage_id)
+
+    def evict(self):
+        """Erase the least-recently used stages until every limit is respected.
+
+        Stages are erased automatically whenever a stage is added. But
+        limits can be changed or stages can be unpinned at any time,
+        which is when this method is useful.
+
+        Returns:
+            list[`pxr.Usd.StageCache.Id`]: The key of every erased stage.
+
+        """
+        with self._lock:
+            return self._evict()
+
+    def get(self, stage_id, pin=False):
+        """Find some cached stage and mark it as recently used.
+
+        Args:
+            stage_id (`pxr.Usd.StageCache.Id`): The key of the stage to find.
+            pin (bool, optional):
+                If True and the stage is found, it's pinned. Call
+                :meth:`unpin` to release it.
+
+        Returns:
+            `pxr.Usd.Stage` or NoneType: The found stage, if any.
+
+        """
+        key = stage_id.ToLongInt()
+
+        with self._lock:
+            stage = self.cache.Find(stage_id)
+
+            if not stage:
+                self._misses += 1
+                self._forget(key)
+
+                return None
+
+            self._hits += 1
+
+            if pin:
+                self._pins[key] += 1
+
+            if key in self._memory:
+                self._touch(key)
+
+            return stage
+
+    def get_statistics(self):
+        """Describe how the cache has been used.
+
+        Returns:
+            dict[str, int]:
+                The number of hits, misses and evictions, the number of
+                tracked stages, their estimated memory in bytes and the
+                number of pinned stages.
+
+        """
+        with self._lock:
+            return {
+                "hits": self._hits,
+                "misses": self._misses,
+                "evictions": self._evictions,
+                "stages": len(self._memory),
+                "memory": sum(self._memory.values()),
+                "pinned": sum(1 for count in self._pins.values() if count),
+            }
+
+    def insert(self, stage, pin=False):
+        """Add some stage to the cache and erase older stages, if needed.
+
+        Args:
+            stage (`pxr.Usd.Stage`): The stage to add.
+            pin (bool, optional):
+                If True, `stage` is pinned before any stage is erased.
+                Call :meth:`unpin` to release it.
+
+        Returns:
+            `pxr.Usd.StageCache.Id`: The key to `stage` in the cache.
+
+        """
+        # Estimating memory may traverse the whole stage so it's done
+        # outside of the lock, so other threads can still use the cache
+        #
+        memory = self._get_memory(stage)
+
+        with self._lock:
+            self.cache.Insert(stage)
+
+            return self._add(stage, memory, pin=pin)
+
+    def open(self, path, load=Usd.Stage.LoadAll, pin=False):
+        """Find the cached stage of some USD file or open it, if it isn't cached.
+
+        If several threads open the same path at once, it's only opened
+        and cached once.
+
+        Args:
+            path (str): The root layer of the stage to open.
+            load (`pxr.Usd.Stage.InitialLoadSet`, optional):
+                The payloads to load, if the stage must be opened.
+            pin (bool, optional):
+                If True, the stage is pinned before any other thread can
+                erase it. Call :meth:`unpin` to release it.
+
+        Returns:
+            `pxr.Usd.StageCache.Id`: The key to the stage in the cache.
+
+        """
+        with self._lock_path(path):
+            layer = Sdf.Layer.Find(path)
+
+            with self._lock:
+                stage = self.cache.FindOneMatching(layer) if layer else None
+
+                if stage:
+                    self._hits += 1
+
+                    if self.cache.GetId(stage).ToLongInt() in self._memory:
+                        return self._add(stage, pin=pin)
+                else:
+                    self._misses += 1
+
+            # Stages are opened (and untracked stages are estimated) outside
+            # of the cache lock so that other threads can use the cache meanwhile
+            #
+            if not stage:
+                stage = Usd.Stage.Open(path, load)
+
+            return self.insert(stage, pin=pin)
+
+    @contextlib.contextmanager
+    def pin(self, stage_id):
+        """Prevent some stage from being erased while it's in use.
+
+        Pins may be nested and may be held from several threads at once.
+
+        Args:
+            stage_id (`pxr.Usd.StageCache.Id`): The key of the stage to pin.
+
+        Raises:
+            ValueError: If `stage_id` isn't in the cache.
+
+        Yields:
+            `pxr.Usd.Stage`: The pinned stage.
+
+        """
+        stage = self.get(stage_id, pin=True)
+
+        if not stage:
+            raise ValueError(
+                'Stage "{stage_id}" is not cached.'.format(stage_id=stage_id.ToString())
+            )
+
+        try:
+            yield stage
+        finally:
+            self.unpin(stage_id)
+
+    def unpin(self, stage_id):
+        """Release one pin of some stage, so it may be erased again.
+
+        Args:
+            stage_id (`pxr.Usd.StageCache.Id`): The key of a stage that was pinned.
+
+        """
+        key = stage_id.ToLongInt()
+
+        with self._lock:
+            if self._pins[key] > 1:
+                self._pins[key] -= 1
+            else:
+                self._pins.pop(key, None)
@@ -0,0 +1,159 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""Open many USD stages at once, on background threads, and add them to a stage cache.
+
+`cache_utils.py` opens stages one at a time, on the main thread. Opening
+a stage is thread-safe as long as no two threads open the same stage so
+an application which needs many stages at startup can open all of them
+at once, instead.
+
+Example:
+    >>> import stage_prewarm
+    >>> from pxr import Usd
+    >>> with stage_prewarm.StagePrewarmer(processes=8) as prewarmer:
+    ...     results = prewarmer.prewarm(
+    ...         [
+    ...             "/shots/010/shot.usda",
+    ...             stage_prewarm.Request("/shots/020/shot.usda", Usd.Stage.LoadNone),
+    ...         ]
+    ...     )
+    ...     stage_ids = [result.get() for result in results]
+
+"""
+
+# IMPORT STANDARD LIBRARIES
+import collections
+import multiprocessing
+import os
+from multiprocessing import pool as pool_
+
+# IMPORT THIRD-PARTY LIBRARIES
+from pxr import Sdf, Usd, UsdUtils
+
+Request = collections.namedtuple("Request", "path load")
+Request.__new__.__defaults__ = (Usd.Stage.LoadAll,)
+
+
+def _open_stage(arguments):
+    """Find the cached stage of some USD file or open it and add it to a cache.
+
+    Args:
+        arguments (tuple[`Request`, `pxr.Usd.StageCache` or `stage_cache_manager.StageCacheManager`]):
+            The stage to open and the cache to add it into.
+
+    Returns:
+        `pxr.Usd.StageCache.Id`: The key to the opened stage in the cache.
+
+    """
+    request, cache = arguments
+
+    if hasattr(cache, "open"):  # A `stage_cache_manager.StageCacheManager`
+        return cache.open(request.path, load=request.load)
+
+    layer = Sdf.Layer.Find(request.path)
+    stage = cache.FindOneMatching(layer) if layer else None
+
+    if not stage:
+        stage = Usd.Stage.Open(request.path, request.load)
+
+    return cache.Insert(stage)
+
+
+class StagePrewarmer(object):
+    """Open stages on a pool of threads and add each one to a stage cache.
+
+    Use this object as a context so that its threads are always stopped.
+
+    """
+
+    def __init__(self, cache=None, processes=None):
+        """Start the threads which open stages.
+
+        Args:
+            cache (`pxr.Usd.StageCache` or `stage_cache_manager.StageCacheManager`, optional):
+                The cache to add opened stages into. If no cache is
+                given, the `pxr.UsdUtils.StageCache` singleton is used.
+            processes (int, optional):
+                The number of stages to open at the same time. If no
+                number is given, one stage is opened per-CPU core.
+
+        """
+        super(StagePrewarmer, self).__init__()
+
+        self.cache = cache or UsdUtils.StageCache.Get()
+        self._pool = pool_.ThreadPool(processes or multiprocessing.cpu_count())
+
+    def __enter__(self):
+        """`StagePrewarmer`: Use this object as a context."""
+        return self
+
+    def __exit__(self, exec_type, exec_value, traceback):
+        """Wait for every stage to open and then stop every thread."""
+        self.close()
+
+    def close(self):
+        """Wait for every stage to open and then stop every thread."""
+        self._pool.close()
+        self._pool.join()
+
+    def prewarm(self, requests):
+        """Start opening every stage in the background.
+
+        Args:
+            requests (iter[str or `Request`]):
+                The root layer of every stage to open. Each path may be
+                paired with the payloads to load. Paths with no load
+                policy load every payload.
+
+        Returns:
+            list[`multiprocessing.pool.AsyncResult`]:
+                The future key of every stage in the cache, in the same
+                order as `requests`. Calling `get()` on a result waits
+                for its stage to open and raises any error from opening it.
+
+        """
+        results = []
+        opening = {}
+
+        for request in requests:
+            if not isinstance(request, Request):
+                request = Request(request)
+
+            # Two threads which open the same stage would open and cache
+            # two stages, even if the stage's path is spelled differently
+            #
+            key = (os.path.normpath(os.path.abspath(request.path)), request.load)
+
+            if key not in opening:
+                opening[key] = self._pool.apply_async(
+                    _open_stage, ((request, self.cache),)
+                )
+
+            results.append(opening[key])
+
+        return results
+
+
+def prewarm(requests, cache=None, processes=None):
+    """Open every stage at once and wait for all of them to be added to a cache.
+
+    Args:
+        requests (iter[str or `Request`]):
+            The root layer of every stage to open and, optionally, the
+            payloads to load.
+        cache (`pxr.Usd.StageCache` or `stage_cache_manager.StageCacheManager`, optional):
+            The cache to add opened stages into. If no cache is given,
+            the `pxr.UsdUtils.StageCache` singleton is used.
+        processes (int, optional):
+            The number of stages to open at the same time. If no number
+            is given, one stage is opened per-CPU core.
+
+    Returns:
+        list[`pxr.Usd.StageCache.Id`]: The key of every stage, in the same order as `requests`.
+
+    """
+    with StagePrewarmer(cache=cache, processes=processes) as prewarmer:
+        results = prewarmer.prewarm(requests)
+
+    return [result.get() for result in results]
@@ -0,0 +1,306 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""Run read-only queries on cached USD stages from many threads at once.
+
+USD stages can be read from many threads at once but only one thread
+may write to a stage at a time and no thread may read a stage while it's
+being written to. :class:`ReaderPool` runs queries on a pool of threads
+and gives every stage a readers-writer lock so that rule is always kept.
+
+Example:
+    >>> import stage_reader_pool
+    >>> def get_prims(stage):
+    ...     return [prim.GetPath() for prim in stage.TraverseAll()]
+    >>> with stage_reader_pool.ReaderPool(processes=8) as pool:
+    ...     results = pool.map(get_prims, stage_ids)
+    ...     with pool.write(stage_ids[0]) as stage:
+    ...         stage.DefinePrim("/SomeSphere", "Sphere")  # Readers of this stage wait
+    ...     paths = [result.get() for result in results]
+    ...     print(pool.get_statistics()["queries_per_second"])
+
+"""
+
+# IMPORT STANDARD LIBRARIES
+import contextlib
+import multiprocessing
+import threading
+import timeit
+import weakref
+from multiprocessing import pool as pool_
+
+# IMPORT THIRD-PARTY LIBRARIES
+from pxr import UsdUtils
+
+_TIMER = timeit.default_timer
+
+
+class StageLock(object):
+    """A lock which lets many threads read or one thread write.
+
+    Writers are preferred. Once a writer is waiting, new readers wait
+    until the writer is done so that a busy stage can still be written to.
+
+    Important:
+        This lock isn't re-entrant. A thread which calls :meth:`read`
+        while it's already reading the same stage deadlocks if a writer
+        is waiting, because the nested read waits for the writer and the
+        writer waits for the outer read.
+
+    """
+
+    def __init__(self):
+        """Create an unlocked lock."""
+        super(StageLock, self).__init__()
+
+        self._condition = threading.Condition(threading.Lock())
+        self._readers = 0
+        self._writing = False
+        self._waiting_writers = 0
+
+    @contextlib.contextmanager
+    def read(self):
+        """Share this lock with every other reader until the context exits.
+
+        Never nest reads of the same lock. See :class:`StageLock`.
+
+        """
+        with self._condition:
+            while self._writing or self._waiting_writers:
+                self._condition.wait()
+
+            self._readers += 1
+
+        try:
+            yield
+        finally:
+            with self._condition:
+                self._readers -= 1
+
+                if not self._readers:
+                    self._condition.notify_all()
+
+    @contextlib.contextmanager
+    def write(self):
+        """Hold this lock, without any readers or other writers, until the context exits."""
+        with self._condition:
+            self._waiting_writers += 1
+
+            try:
+                while self._writing or self._readers:
+                    self._condition.wait()
+            finally:
+                self._waiting_writers -= 1
+
+            self._writing = True
+
+        try:
+            yield
+        finally:
+            with self._condition:
+                self._writing = False
+                self._condition.notify_all()
+
+
+class ReaderPool(object):
+    """Run queries on cached stages, from many threads, while respecting USD's one-writer rule.
+
+    Every query must only read from its stage. Use :meth:`write` to
+    change a stage that the pool's queries may be reading.
+
+    """
+
+    def __init__(self, cache=None, processes=None):
+        """Start the threads which run queries.
+
+        Args:
+            cache (`pxr.Usd.StageCache` or `stage_cache_manager.StageCacheManager`, optional):
+                The cache to find stages in. If a
+                `stage_cache_manager.StageCacheManager` is given, each
+                stage is pinned while it is queried. If no cache is
+                given, the `pxr.UsdUtils.StageCache` singleton is used.
+            processes (int, optional):
+                The number of queries to run at the same time. If no
+                number is given, one query is run per-CPU core.
+
+        """
+        super(ReaderPool, self).__init__()
+
+        self.cache = cache or UsdUtils.StageCache.Get()
+
+        self._processes = processes or multiprocessing.cpu_count()
+        self._lock = threading.Lock()
+        # Each lock is only kept while a query or a writer uses it, so
+        # stages which are no longer queried don't keep their lock forever
+        #
+        self._locks = weakref.WeakValueDictionary()
+        self._pool = pool_.ThreadPool(self._processes)
+        self._start = _TIMER()
+        self._queries = 0
+        self._failures = 0
+        self._busy = 0.0
+        self._waiting = 0.0
+
+    def __enter__(self):
+        """`ReaderPool`: Use this object as a context."""
+        return self
+
+    def __exit__(self, exec_type, exec_value, traceback):
+        """Wait for every query to finish and then stop every thread."""
+        self.close()
+
+    @contextlib.contextmanager
+    def _get_stage(self, stage_id):
+        """Find some cached stage and keep it cached until the context exits.
+
+        Args:
+            stage_id (`pxr.Usd.StageCache.Id`): The key of the stage to find.
+
+        Raises:
+            ValueError: If `stage_id` isn't in the cache.
+
+        Yields:
+            `pxr.Usd.Stage`: The found stage.
+
+        """
+        if hasattr(self.cache, "pin"):  # A `stage_cache_manager.StageCacheManager`
+            with self.cache.pin(stage_id) as stage:
+                yield stage
+
+            return
+
+        stage = self.cache.Find(stage_id)
+
+        if not stage:
+            raise ValueError(
+                'Stage "{stage_id}" is not cached.'.format(stage_id=stage_id.ToString())
+            )
+
+        yield stage
+
+    def _get_lock(self, stage_id):
+        """`StageLock`: Get the lock of some stage, creating it if needed."""
+        key = stage_id.ToLongInt()
+
+        with self._lock:
+            lock = self._locks.get(key)
+
+            if lock is None:
+                lock = StageLock()
+                self._locks[key] = lock
+
+            return lock
+
+    def _run(self, arguments):
+        """Run one query, while holding the read lock of its stage.
+
+        Args:
+            arguments (tuple[`pxr.Usd.StageCache.Id`, callable[`pxr.Usd.Stage`]]):
+                The stage to query and the query to run.
+
+        Returns:
+            object: Whatever the query returns.
+
+        """
+        stage_id, query = arguments
+        lock = self._get_lock(stage_id)
+        start = _TIMER()
+        succeeded = False
+
+        try:
+            with self._get_stage(stage_id) as stage, lock.read():
+                started = _TIMER()
+
+                try:
+                    result = query(stage)
+                    succeeded = True
+                finally:
+                    end = _TIMER()
+        finally:
+            with self._lock:
+                self._queries += 1
+
+                if succeeded:
+                    self._waiting += started - start
+                    self._busy += end - started
+                else:
+                    self._failures += 1
+
+        return result
+
+    def close(self):
+        """Wait for every query to finish and then stop every thread."""
+        self._pool.close()
+        self._pool.join()
+
+    def get_statistics(self):
+        """Describe how many queries were run and how quickly.
+
+        Returns:
+            dict[str, float or int]:
+                The number of finished and failed queries, the seconds
+                since the pool started, the seconds spent running and
+                waiting for locks, the finished queries per second and
+                the fraction of time that the pool's threads were running queries.
+
+        """
+        with self._lock:
+            seconds = _TIMER() - self._start
+
+            return {
+                "queries": self._queries,
+                "failures": self._failures,
+                "seconds": seconds,
+                "busy_seconds": self._busy,
+                "waiting_seconds": self._waiting,
+                "queries_per_second": self._queries / seconds if seconds else 0.0,
+                "utilization": (
+                    self._busy / (seconds * self._processes) if seconds else 0.0
+                ),
+            }
+
+    def map(self, query, stage_ids):
+        """Run the same query on several stages.
+
+        Args:
+            query (callable[`pxr.Usd.Stage`]): A function which only reads from its stage.
+            stage_ids (iter[`pxr.Usd.StageCache.Id`]): The keys of every stage to query.
+
+        Returns:
+            list[`multiprocessing.pool.AsyncResult`]:
+                The future result of every query, in the same order as `stage_ids`.
+
+        """
+        return [self.submit(stage_id, query) for stage_id in stage_ids]
+
+    def submit(self, stage_id, query):
+        """Run some query on some stage, in the background.
+
+        Args:
+            stage_id (`pxr.Usd.StageCache.Id`): The key of the stage to query.
+            query (callable[`pxr.Usd.Stage`]): A function which only reads from its stage.
+
+        Returns:
+            `multiprocessing.pool.AsyncResult`:
+                The future result of `query`. Calling `get()` waits for
+                the query and raises any error that the query raised.
+
+        """
+        return self._pool.apply_async(self._run, ((stage_id, query),))
+
+    @contextlib.contextmanager
+    def write(self, stage_id):
+        """Change some stage while no query reads from it.
+
+        Args:
+            stage_id (`pxr.Usd.StageCache.Id`): The key of the stage to change.
+
+        Raises:
+            ValueError: If `stage_id` isn't in the cache.
+
+        Yields:
+            `pxr.Usd.Stage`: The stage to write to.
+
+        """
+        with self._get_stage(stage_id) as stage, self._get_lock(stage_id).write():
+            yield stage
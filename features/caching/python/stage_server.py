@@ -0,0 +1,474 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""Share opened USD stages between processes with a local stage server.
+
+`pxr.Usd.StageCache.Id` keys only mean something inside of the process
+that created them. If several processes on the same machine need the
+same large stage, each process opens its own copy. This module lets one
+server process open and cache each stage once and then answer read-only
+queries about it, over a Unix socket.
+
+Each request and response is one line of JSON. Stages are addressed
+by their cache key (as returned by :meth:`StageClient.open`), by the
+path to their root layer, which opens the stage if needed, or by both,
+in which case the stage is re-opened if the server erased it.
+
+Example:
+    Start a server
+
+    >>> python stage_server.py /tmp/stages.sock --maximum-stages 4
+
+    And then query it from any other process
+
+    >>> import stage_server
+    >>> client = stage_server.StageClient("/tmp/stages.sock")
+    >>> stage = client.open("/shots/010/shot.usda")
+    >>> client.get_prims(stage, root="/World", type_name="Mesh")
+    ['/World/geo/body', ...]
+    >>> client.get_attribute_values(stage, "/World/geo/body", "points", times=[1001, 1002])
+    [[1001.0, [[0.0, 1.0, 0.0], ...]], [1002.0, [[0.0, 1.1, 0.0], ...]]]
+
+"""
+
+# IMPORT FUTURE LIBRARIES
+from __future__ import print_function
+
+# IMPORT STANDARD LIBRARIES
+import argparse
+import json
+import os
+import socket
+
+try:
+    import socketserver
+except ImportError:  # Python 2
+    import SocketServer as socketserver
+
+# IMPORT THIRD-PARTY LIBRARIES
+from pxr import Usd
+
+# IMPORT LOCAL LIBRARIES
+import stage_cache_manager
+
+_LOADS = {"all": Usd.Stage.LoadAll, "none": Usd.Stage.LoadNone}
+
+
+class StageServerError(Exception):
+    """An error that the stage server returned, instead of a result."""
+
+    pass
+
+
+def _to_json(value):
+    """Convert some USD value into something that can be written as JSON.
+
+    Args:
+        value (object): Any USD value. e.g. a `pxr.Gf.Vec3f` or a `pxr.Vt.Matrix4dArray`.
+
+    Returns:
+        object: The converted value.
+
+    """
+    if value is None or isinstance(value, (bool, int, float)):
+        return value
+
+    if hasattr(value, "GetReal"):  # A quaternion
+        return [value.GetReal()] + list(value.GetImaginary())
+
+    if hasattr(value, "resolvedPath"):  # A `pxr.Sdf.AssetPath`
+        return value.path
+
+    # Vectors, matrices and Vt arrays are all sequences
+    if hasattr(value, "__len__") and not isinstance(value, (str, bytes)):
+        try:
+            return [_to_json(item) for item in value]
+        except TypeError:
+            pass
+
+    return str(value)
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    """Answer every request that one client sends."""
+
+    def _get_attribute_values(self, stage, request):
+        """Get the value of some attribute, at every requested time."""
+        attribute = stage.GetAttributeAtPath(
+            "{prim}.{attribute}".format(
+                prim=request["prim"], attribute=request["attribute"]
+            )
+        )
+
+        if not attribute:
+            raise ValueError(
+                'Attribute "{prim}.{attribute}" does not exist.'.format(
+                    prim=request["prim"], attribute=request["attribute"]
+                )
+            )
+
+        times = request.get("times")
+
+        if times is None:
+            return _to_json(attribute.Get())
+
+        return [[time, _to_json(attribute.Get(time))] for time in times]
+
+    def _get_id(self, stage, request):  # pylint: disable=unused-argument
+        """Get the cache key of some stage, so clients can find it again."""
+        return self.server.manager.cache.GetId(stage).ToString()
+
+    def _get_prims(self, stage, request):
+        """Get the path of every prim under some root prim."""
+        root = stage.GetPrimAtPath(request.get("root") or "/")
+
+        if not root:
+            raise ValueError(
+                'Prim "{root}" does not exist.'.format(root=request.get("root"))
+            )
+
+        type_name = request.get("type_name")
+        paths = []
+
+        for prim in Usd.PrimRange.AllPrims(root):
+            if not type_name or prim.GetTypeName() == type_name:
+                paths.append(str(prim.GetPath()))
+
+        return paths
+
+    def _acquire(self, request):
+        """Find and pin the stage of some request, opening it if needed.
+
+        If the request has a cache key and a path and the key's stage
+        was erased, the stage is re-opened from the path.
+
+        Args:
+            request (dict[str, object]): The "id" and / or "path" of the stage to find.
+
+        Raises:
+            ValueError: If the stage isn't cached and the request has no path.
+
+        Returns:
+            tuple[`pxr.Usd.StageCache.Id`, `pxr.Usd.Stage`]:
+                The key to the pinned stage and the stage itself.
+                Call `stage_cache_manager.StageCacheManager.unpin` to release it.
+
+        """
+        manager = self.server.manager
+
+        if request.get("id"):
+            stage_id = Usd.StageCache.Id.FromString(request["id"])
+            stage = manager.get(stage_id, pin=True)
+
+            if stage:
+                return stage_id, stage
+
+            if not request.get("path"):
+                raise ValueError(
+                    'Stage "{stage_id}" is not cached.'.format(stage_id=request["id"])
+                )
+
+        load = request.get("load", "all")
+
+        if load not in _LOADS:
+            raise ValueError(
+                'Load "{load}" must be one of "{options}".'.format(
+                    load=load, options=sorted(_LOADS)
+                )
+            )
+
+        stage_id = self.server.open(request["path"], load=_LOADS[load], pin=True)
+
+        return stage_id, manager.cache.Find(stage_id)
+
+    def _respond(self, request):
+        """Run one request and return its result.
+
+        Args:
+            request (dict[str, object]): The command to run and its arguments.
+
+        Raises:
+            ValueError: If the command is unknown.
+
+        Returns:
+            object: The result of the request.
+
+        """
+        command = request.get("command")
+        manager = self.server.manager
+
+        if command == "statistics":
+            return manager.get_statistics()
+
+        queries = {
+            "attribute": self._get_attribute_values,
+            "open": self._get_id,
+            "prims": self._get_prims,
+        }
+
+        if command not in queries:
+            raise ValueError('Command "{command}" is unknown.'.format(command=command))
+
+        # The stage is pinned as it's found so another client can't erase it mid-query
+        stage_id, stage = self._acquire(request)
+
+        try:
+            return queries[command](stage, request)
+        finally:
+            manager.unpin(stage_id)
+
+    def handle(self):
+        """Answer each line of JSON with one line of JSON, until the client disconnects."""
+        for line in iter(self.rfile.readline, b""):
+            try:
+                response = {"result": self._respond(json.loads(line.decode("utf-8")))}
+            except Exception as error:  # pylint: disable=broad-except
+                response = {
+                    "error": "{name}: {error}".format(
+                        name=type(error).__name__, error=error
+                    )
+                }
+
+            self.wfile.write((json.dumps(response) + "\n").encode("utf-8"))
+            self.wfile.flush()
+
+
+class StageServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """A server which keeps stages open and answers queries about them, one thread per-client."""
+
+    daemon_threads = True
+
+    def __init__(self, path, manager=None):
+        """Listen for clients on some Unix socket.
+
+        Args:
+            path (str): The socket file to create. Any existing file is replaced.
+            manager (`stage_cache_manager.StageCacheManager`, optional):
+                The object which opens and caches every stage. If no
+                object is given, stages are cached without any limit.
+
+        """
+        if os.path.exists(path):
+            os.remove(path)
+
+        socketserver.UnixStreamServer.__init__(self, path, _Handler)
+
+        self.manager = manager or stage_cache_manager.StageCacheManager()
+
+    def open(self, path, load=Usd.Stage.LoadAll, pin=False):
+        """Find the cached stage of some USD file or open it, if it isn't cached.
+
+        If several clients ask for the same stage at once, it's only
+        opened once. See `stage_cache_manager.StageCacheManager.open`.
+
+        Args:
+            path (str): The root layer of the stage to open.
+            load (`pxr.Usd.Stage.InitialLoadSet`, optional): The payloads to load.
+            pin (bool, optional):
+                If True, the stage is pinned before any other client can
+                erase it. Call `stage_cache_manager.StageCacheManager.unpin`
+                to release it.
+
+        Returns:
+            `pxr.Usd.StageCache.Id`: The key to the stage in the cache.
+
+        """
+        return self.manager.open(path, load=load, pin=pin)
+
+    def server_close(self):
+        """Stop listening and remove the socket file."""
+        socketserver.UnixStreamServer.server_close(self)
+
+        if os.path.exists(self.server_address):
+            os.remove(self.server_address)
+
+
+class StageClient(object):
+    """Query the stages of a :class:`StageServer` from another process.
+
+    Each client uses one connection. Use one client per-thread.
+
+    """
+
+    def __init__(self, path):
+        """Connect to some stage server.
+
+        Args:
+            path (str): The socket file of the server.
+
+        """
+        super(StageClient, self).__init__()
+
+        self._socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self._socket.connect(path)
+        self._file = self._socket.makefile("rwb")
+        self._paths = {}  # Each cache key's root layer, in case the server erases it
+
+    def __enter__(self):
+        """`StageClient`: Use this object as a context."""
+        return self
+
+    def __exit__(self, exec_type, exec_value, traceback):
+        """Disconnect from the server."""
+        self.close()
+
+    def _request(self, command, **kwargs):
+        """Send one request to the server and wait for its result.
+
+        Raises:
+            StageServerError: If the server fails to run the request.
+
+        Returns:
+            object: The JSON result of the request.
+
+        """
+        kwargs["command"] = command
+        self._file.write((json.dumps(kwargs) + "\n").encode("utf-8"))
+        self._file.flush()
+        line = self._file.readline()
+
+        if not line:
+            raise StageServerError("The server closed the connection.")
+
+        response = json.loads(line.decode("utf-8"))
+
+        if "error" in response:
+            raise StageServerError(response["error"])
+
+        return response["result"]
+
+    def _get_address(self, stage):
+        """Describe some stage as a cache key and / or a root layer path.
+
+        If the stage of a cache key was erased by the server, the server
+        re-opens it from the key's path.
+
+        Args:
+            stage (str): The cache key or root layer path of some stage.
+
+        Returns:
+            dict[str, str]: The "id" and / or "path" of `stage`.
+
+        """
+        if os.path.isabs(stage):
+            return {"path": stage}
+
+        address = {"id": stage}
+
+        if stage in self._paths:
+            address["path"], address["load"] = self._paths[stage]
+
+        return address
+
+    def close(self):
+        """Disconnect from the server."""
+        self._file.close()
+        self._socket.close()
+
+    def get_attribute_values(self, stage, prim, attribute, times=None):
+        """Get the values of some attribute.
+
+        Args:
+            stage (str): The cache key or root layer path of the stage to query.
+            prim (str): The path to the prim of the attribute. e.g. "/World/geo/body".
+            attribute (str): The name of the attribute. e.g. "points".
+            times (iter[float], optional):
+                The times to get values at. If no times are given, the
+                attribute's default value is returned.
+
+        Raises:
+            StageServerError: If the attribute doesn't exist.
+
+        Returns:
+            object or list[list[float, object]]:
+                The default value or the time and value of every time,
+                converted to JSON types.
+
+        """
+        return self._request(
+            "attribute",
+            prim=prim,
+            attribute=attribute,
+            times=list(times) if times is not None else None,
+            **self._get_address(stage)
+        )
+
+    def get_prims(self, stage, root="/", type_name=""):
+        """Get the path of every prim under some prim, including inactive or unloaded prims.
+
+        Args:
+            stage (str): The cache key or root layer path of the stage to query.
+            root (str, optional): The prim to search under. Default: "/".
+            type_name (str, optional): If given, only return prims of this type. e.g. "Mesh".
+
+        Returns:
+            list[str]: Every found prim path.
+
+        """
+        return self._request(
+            "prims", root=root, type_name=type_name, **self._get_address(stage)
+        )
+
+    def get_statistics(self):
+        """dict[str, int]: Get the cache hits, misses, evictions and memory of the server."""
+        return self._request("statistics")
+
+    def open(self, path, load="all"):
+        """Open some stage on the server, if it isn't already open.
+
+        Args:
+            path (str): The root layer of the stage to open.
+            load (str, optional): Load every payload ("all") or no payloads ("none").
+
+        Returns:
+            str: The key to the stage. Use it to query the stage without re-finding it.
+
+        """
+        stage = self._request("open", path=path, load=load)
+        self._paths[stage] = (path, load)
+
+        return stage
+
+
+def _parse_arguments(text):
+    """`argparse.Namespace`: Get the user's settings for the server."""
+    parser = argparse.ArgumentParser(
+        description="Keep USD stages open and answer queries about them over a Unix socket."
+    )
+    parser.add_argument("socket", help="The socket file to listen on.")
+    parser.add_argument(
+        "--maximum-stages",
+        type=int,
+        help="The most stages to keep open at once.",
+    )
+    parser.add_argument(
+        "--maximum-memory",
+        type=int,
+        help="The most memory, in megabytes, that open stages may use.",
+    )
+
+    return parser.parse_args(text)
+
+
+def main(text=None):
+    """Run a stage server until it's interrupted."""
+    arguments = _parse_arguments(text)
+    manager = stage_cache_manager.StageCacheManager(
+        maximum_stages=arguments.maximum_stages,
+        maximum_memory=(
+            arguments.maximum_memory * 1024 * 1024 if arguments.maximum_memory else None
+        ),
+    )
+    server = StageServer(arguments.socket, manager=manager)
+    print('Serving stages on "{path}".'.format(path=arguments.socket))
+
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,299 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""Let any thread author to a USD stage by queueing edits for one writer thread.
+
+A stage may only be written to by one thread at a time. Instead of each
+thread waiting for its turn, threads submit their edits to a
+:class:`StageWriter`, which runs every edit on one dedicated thread. Any
+edits which are waiting are run together, as one batch, inside of a
+`pxr.Sdf.ChangeBlock` so that the stage only processes one change
+notice per-batch.
+
+Important:
+    USD API calls which may create specs or read composed values aren't
+    safe inside of a `pxr.Sdf.ChangeBlock`. Edits should use the Sdf API
+    (e.g. `pxr.Sdf.CreatePrimInLayer`) on the layer they're given. For
+    edits that need the Usd API, create the writer with `use_change_block=False`.
+
+Example:
+    >>> import functools
+    >>> import stage_writer
+    >>> from pxr import Sdf, Usd
+    >>> def create_sphere(index, stage, layer):
+    ...     spec = Sdf.CreatePrimInLayer(layer, "/SomeSphere{index}".format(index=index))
+    ...     spec.specifier = Sdf.SpecifierDef
+    ...     spec.typeName = "Sphere"
+    >>> with stage_writer.StageWriter(Usd.Stage.CreateInMemory()) as writer:
+    ...     results = [writer.submit(functools.partial(create_sphere, index)) for index in range(1000)]
+    >>> results[0].successful()
+    True
+
+"""
+
+# IMPORT STANDARD LIBRARIES
+import contextlib
+import threading
+
+try:
+    import queue
+except ImportError:  # Python 2
+    import Queue as queue
+
+# IMPORT THIRD-PARTY LIBRARIES
+from pxr import Sdf
+
+_STOP = object()
+
+
+@contextlib.contextmanager
+def _optional(context):
+    """Enter some context, if one is given. Otherwise do nothing."""
+    if context is None:
+        yield
+
+        return
+
+    with context:
+        yield
+
+
+class EditResult(object):
+    """The future result of one edit.
+
+    Its methods match `multiprocessing.pool.AsyncResult`.
+
+    """
+
+    def __init__(self):
+        """Create a result for an edit that hasn't run yet."""
+        super(EditResult, self).__init__()
+
+        self._event = threading.Event()
+        self._value = None
+        self._error = None
+
+    def _set(self, value=None, error=None):
+        """Store the return value or raised error of the edit and wake every waiting thread."""
+        self._value = value
+        self._error = error
+        self._event.set()
+
+    def get(self, timeout=None):
+        """Wait for the edit to run and get its return value.
+
+        Args:
+            timeout (float, optional): The most seconds to wait. Default: wait forever.
+
+        Raises:
+            RuntimeError: If `timeout` seconds pass before the edit runs.
+            Exception: Any error that the edit raised.
+
+        Returns:
+            object: Whatever the edit returned.
+
+        """
+        if not self._event.wait(timeout):
+            raise RuntimeError("The edit did not run in time.")
+
+        if self._error is not None:
+            raise self._error
+
+        return self._value
+
+    def ready(self):
+        """bool: Check if the edit ran."""
+        return self._event.is_set()
+
+    def successful(self):
+        """bool: Check if the edit ran without raising an error."""
+        if not self.ready():
+            raise ValueError("The edit has not run yet.")
+
+        return self._error is None
+
+    def wait(self, timeout=None):
+        """Wait for the edit to run.
+
+        Args:
+            timeout (float, optional): The most seconds to wait. Default: wait forever.
+
+        """
+        self._event.wait(timeout)
+
+
+class StageWriter(object):
+    """Run every edit of some stage on one thread, in batches.
+
+    Use this object as a context so that its thread is always stopped.
+
+    """
+
+    def __init__(self, stage, batch_size=1000, use_change_block=True, lock=None):
+        """Start the thread which writes to `stage`.
+
+        Args:
+            stage (`pxr.Usd.Stage`): The stage to write to.
+            batch_size (int, optional):
+                The most edits to run inside of one change block. Default: 1000.
+            use_change_block (bool, optional):
+                If True, each batch runs inside of a `pxr.Sdf.ChangeBlock`.
+                Default is True.
+            lock (`stage_reader_pool.StageLock`, optional):
+                If given, the write lock is held while each batch runs,
+                so readers of a `stage_reader_pool.ReaderPool` never
+                read `stage` mid-batch.
+
+        Raises:
+            ValueError: If `batch_size` is less than 1.
+
+        """
+        super(StageWriter, self).__init__()
+
+        if batch_size < 1:
+            raise ValueError(
+                'Batch size "{batch_size}" must be at least 1.'.format(
+                    batch_size=batch_size
+                )
+            )
+
+        self.stage = stage
+        self.batch_size = batch_size
+        self.use_change_block = use_change_block
+
+        self._lock = lock
+        self._submit_lock = threading.Lock()
+        self._queue = queue.Queue()
+        self._edits = 0
+        self._batches = 0
+        self._closed = False
+        self._thread = threading.Thread(target=self._run)
+        self._thread.daemon = True
+        self._thread.start()
+
+    def __enter__(self):
+        """`StageWriter`: Use this object as a context."""
+        return self
+
+    def __exit__(self, exec_type, exec_value, traceback):
+        """Run every submitted edit and then stop the writer thread."""
+        self.close()
+
+    def _get_batch(self):
+        """Wait for 1+ edits and then get every waiting edit, up to the batch size.
+
+        Returns:
+            list[tuple[callable, `EditResult`] or object]:
+                Every edit to run. The last item may be a sentinel, to
+                stop the writer thread.
+
+        """
+        batch = [self._queue.get()]
+
+        while len(batch) < self.batch_size and batch[-1] is not _STOP:
+            try:
+                batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+
+        return batch
+
+    def _run(self):
+        """Run batches of edits until the writer is closed."""
+        while True:
+            batch = self._get_batch()
+            stopping = batch[-1] is _STOP
+            edits = batch[:-1] if stopping else batch
+
+            try:
+                if edits:
+                    self._run_batch(edits)
+            except Exception as error:  # pylint: disable=broad-except
+                # The thread must keep running or every waiting result would wait forever
+                for _, result in edits:
+                    if not result.ready():
+                        result._set(error=error)  # pylint: disable=protected-access
+
+            for _ in batch:
+                self._queue.task_done()
+
+            if stopping:
+                return
+
+    def _run_batch(self, edits):
+        """Run several edits, at once, on the writer thread.
+
+        An edit which raises an error doesn't stop the other edits from running.
+
+        Args:
+            edits (list[tuple[callable, `EditResult`]]): Every edit to run.
+
+        """
+        layer = self.stage.GetEditTarget().GetLayer()
+        finished = []
+
+        with _optional(self._lock.write() if self._lock else None), _optional(
+            Sdf.ChangeBlock() if self.use_change_block else None
+        ):
+            for edit, result in edits:
+                try:
+                    finished.append((result, edit(self.stage, layer), None))
+                except Exception as error:  # pylint: disable=broad-except
+                    finished.append((result, None, error))
+
+        self._edits += len(edits)
+        self._batches += 1
+
+        # Results are only given once the change block closes and the stage is up to date
+        for result, value, error in finished:
+            result._set(value=value, error=error)  # pylint: disable=protected-access
+
+    def close(self):
+        """Run every submitted edit and then stop the writer thread."""
+        with self._submit_lock:
+            if self._closed:
+                return
+
+            self._closed = True
+            self._queue.put(_STOP)
+
+        self._thread.join()
+
+    def flush(self):
+        """Wait until every submitted edit has run."""
+        self._queue.join()
+
+    def get_statistics(self):
+        """dict[str, int]: Get the number of edits and batches which were run and are waiting."""
+        return {
+            "edits": self._edits,
+            "batches": self._batches,
+            "waiting": self._queue.qsize(),
+        }
+
+    def submit(self, edit):
+        """Queue some edit to run on the writer thread.
+
+        Args:
+            edit (callable[`pxr.Usd.Stage`, `pxr.Sdf.Layer`]):
+                A function which writes to the given stage or to its
+                current edit target Layer.
+
+        Raises:
+            RuntimeError: If the writer was closed.
+
+        Returns:
+            `EditResult`: The future return value of `edit`.
+
+        """
+        result = EditResult()
+
+        # Edits must never be queued after the writer thread's stop sentinel
+        with self._submit_lock:
+            if self._closed:
+                raise RuntimeError("This writer is closed and accepts no more edits.")
+
+            self._queue.put((edit, result))
+
+        return result
+
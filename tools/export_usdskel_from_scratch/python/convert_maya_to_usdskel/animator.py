@@ -4,12 +4,21 @@
 """A set of helper functions related to animation and keys in Maya."""
 
 import collections
+import hashlib
 import sys
 
 from maya import cmds
+from maya.api import OpenMaya
 from pxr import Gf
 
-from . import helper
+from . import helper, profiler
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+_SPACES = ("local", "world")
 
 
 def get_animation_range(nodes):
@@ -64,6 +73,99 @@ def get_animation_range(nodes):
     return (start, end)
 
 
+def _get_upstream_nodes(nodes):
+    """Find every Maya node that could affect the transforms of some nodes.
+
+    This includes the history of each node (constraints, IK, animation
+    layers, controls, etc) and the history of every DAG parent that
+    appears in that history, because moving a control's parent moves
+    the control, too.
+
+    Args:
+        nodes (iter[str]): The Maya nodes to search from. e.g. joints.
+
+    Returns:
+        set[str]: The long name of every found node, including `nodes`.
+
+    """
+    found = set()
+    pending = list(nodes)
+
+    while pending:
+        history = set(cmds.ls(cmds.listHistory(pending) or [], long=True) or [])
+        new = history - found
+        found.update(new)
+        parents = set()
+
+        for path in cmds.ls(list(new), long=True, type="dagNode") or []:
+            parts = path.split("|")
+
+            for index in range(2, len(parts)):
+                parents.add("|".join(parts[:index]))
+
+        pending = sorted(parents - found)
+
+    return found
+
+
+def get_animation_curves(nodes):
+    """list[str]: Find every animation curve upstream of some Maya nodes."""
+    return sorted(cmds.ls(list(_get_upstream_nodes(nodes)), type="animCurve") or [])
+
+
+def get_undriven_nodes(nodes):
+    """Find every node which no animation curve drives.
+
+    Animation curves can't describe how these nodes move so the hashes
+    of :func:`get_curves_hash` can't be trusted to notice their changes.
+
+    Args:
+        nodes (iter[str]): The Maya nodes to check. e.g. joints.
+
+    Returns:
+        list[str]: Every node in `nodes` with no animation curve upstream.
+
+    """
+    return [node for node in nodes if not get_animation_curves([node])]
+
+
+def get_curves_hash(curves, start, end):
+    """Describe every key that affects some animation curves between two times.
+
+    The keys just outside of `start` and `end` are included, because
+    they change how the curve interpolates inside of the range.
+
+    Args:
+        curves (iter[str]): The Maya animation curves to check.
+        start (float or int): The first time to check.
+        end (float or int): The last time to check.
+
+    Returns:
+        str: A hash of every key's time, value and tangents.
+
+    """
+    digest = hashlib.sha1()
+
+    for curve in curves:
+        low = min(cmds.findKeyframe(curve, time=(start, start), which="previous"), start)
+        high = max(cmds.findKeyframe(curve, time=(end, end), which="next"), end)
+        keys = cmds.keyframe(
+            curve, query=True, time=(low, high), timeChange=True, valueChange=True
+        )
+        tangents = cmds.keyTangent(
+            curve,
+            query=True,
+            time=(low, high),
+            inAngle=True,
+            outAngle=True,
+            inWeight=True,
+            outWeight=True,
+        )
+        digest.update(repr((curve, keys, tangents)).encode("utf-8"))
+
+    return digest.hexdigest()
+
+
 def get_joint_world_space_transforms(joints, times):
     """Get the world-space matrices for every given joint at every given time.
 
@@ -75,12 +177,20 @@ def get_joint_world_space_transforms(joints, times):
             transforms for each joint in `joints`.
 
     Returns:
-        dict[int or float, list[int]]:
-            The matrices for every joint in `joints` for each time in
-            `times`. The return values is a **flat** matrix. (It's not a
-            4x4 matrix, it's a list of 16 elements.)
+        dict[int or float, list[`pxr.Gf.Matrix4d`]]:
+            The matrices for every joint in `joints` for each time in `times`.
 
     """
+    times = list(times)
+
+    if numpy is not None:
+        matrices = get_node_matrices_at_times(joints, times, "world")
+
+        return {
+            time_code: [Gf.Matrix4d(*matrix) for matrix in time_matrices.tolist()]
+            for time_code, time_matrices in zip(times, matrices)
+        }
+
     output = collections.defaultdict(list)
 
     for node_time_transforms in get_node_transforms_at_times(joints, times, "world"):
@@ -90,6 +200,128 @@ def get_joint_world_space_transforms(joints, times):
     return dict(output)
 
 
+def get_local_matrices(world_matrices, parent_indices):
+    """Convert world-space matrices into local-space matrices for every time at once.
+
+    This is the same as calling `pxr.UsdSkel.ComputeJointLocalTransforms`
+    once per-time but every time is computed in a single NumPy operation.
+
+    Args:
+        world_matrices (`numpy.ndarray`):
+            Flat, row-major world-space matrices, shaped (times, joints, 16).
+            e.g. The output of :func:`get_node_matrices_at_times`.
+        parent_indices (iter[int]):
+            The index of the parent of each joint or -1, for root joints.
+            e.g. `pxr.UsdSkel.Topology.GetParentIndices()`.
+
+    Raises:
+        EnvironmentError: If NumPy cannot be imported.
+
+    Returns:
+        `numpy.ndarray`: The local-space matrices, shaped (times, joints, 4, 4).
+
+    """
+    if numpy is None:
+        raise EnvironmentError("NumPy is required to compute local matrices in bulk.")
+
+    world_matrices = numpy.asarray(world_matrices, dtype=numpy.float64)
+    world_matrices = world_matrices.reshape(world_matrices.shape[:2] + (4, 4))
+    parent_indices = numpy.asarray(parent_indices, dtype=numpy.intp)
+    roots = parent_indices < 0
+
+    # Maya and USD matrices are row-major so `world = local * parent_world`
+    parent_inverses = numpy.linalg.inv(
+        world_matrices[:, numpy.where(roots, 0, parent_indices)]
+    )
+    local_matrices = numpy.matmul(world_matrices, parent_inverses)
+    local_matrices[:, roots] = world_matrices[:, roots]
+
+    return local_matrices
+
+
+def get_position_extents(world_matrices):
+    """Find the bounding box of every joint's position, for each time.
+
+    Args:
+        world_matrices (`numpy.ndarray`):
+            Flat, row-major world-space matrices, shaped (times, joints, 16).
+
+    Raises:
+        EnvironmentError: If NumPy cannot be imported.
+
+    Returns:
+        `numpy.ndarray`: The minimum and maximum positions, shaped (times, 2, 3).
+
+    """
+    if numpy is None:
+        raise EnvironmentError("NumPy is required to compute extents in bulk.")
+
+    # Flat, row-major matrices store their translation in elements 12-14
+    positions = numpy.asarray(world_matrices)[:, :, 12:15]
+
+    return numpy.stack((positions.min(axis=1), positions.max(axis=1)), axis=1)
+
+
+def get_node_matrices_at_times(nodes, times, space):
+    """Sample the flat transform matrix of every node at every time, in bulk.
+
+    Unlike :func:`get_node_transforms_at_times`, the scene time is only
+    changed once per-time and every node's matrix is read directly from
+    the Maya API, instead of calling `cmds.getAttr` for each node at each
+    time. The scene's current time is restored once sampling is done.
+
+    Args:
+        nodes (iter[str]):
+            The Maya DAG nodes to get transformation data from.
+        times (iter[float or int]):
+            The times to sample, in the scene's current time unit.
+        space (str):
+            The possible transformations that can be queried.
+            Options: ["local", "world"].
+
+    Raises:
+        EnvironmentError: If NumPy cannot be imported.
+        ValueError: If the given `space` is not "local" or "world".
+
+    Returns:
+        `numpy.ndarray`:
+            A contiguous array of 64-bit floats, shaped (times, nodes, 16).
+            Each matrix is flat and row-major, the same as `cmds.getAttr`
+            returns it.
+
+    """
+    if numpy is None:
+        raise EnvironmentError("NumPy is required to sample matrices in bulk.")
+
+    if space not in _SPACES:
+        raise ValueError(
+            'Space "{space}" is invalid. Options were, "{spaces}".'.format(
+                space=space, spaces=sorted(_SPACES)
+            )
+        )
+
+    times = list(times)
+    paths = helper.get_dag_paths(nodes)
+    output = numpy.empty((len(times), len(paths), 16), dtype=numpy.float64)
+
+    if space == "world":
+        get_matrix = OpenMaya.MDagPath.inclusiveMatrix
+        call = "api.MDagPath.inclusiveMatrix"
+    else:
+
+        def get_matrix(path):
+            return OpenMaya.MFnDagNode(path).transformationMatrix()
+
+        call = "api.MFnDagNode.transformationMatrix"
+
+    profiler.count(call, len(times) * len(paths))
+
+    for index, _ in helper.iter_times(times):
+        output[index] = [tuple(get_matrix(path)) for path in paths]
+
+    return output
+
+
 def get_node_transforms_at_times(nodes, times, space):
     """Get the transform matrices of every node at the given times.
 
@@ -0,0 +1,297 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""Export many rigs at once, each in its own headless mayapy process.
+
+Every rig is exported by a separate mayapy process so that rigs export
+in parallel. A rig that fails to export is retried and, once every rig
+is done, a summary of every export is returned (and optionally saved).
+
+This module doesn't need Maya to be imported. The Maya-specific part
+only runs inside of each worker process.
+
+Example:
+    >>> from convert_maya_to_usdskel import batch
+    >>> jobs = [
+    ...     batch.Job("/scenes/hero.ma", "root_joint", "/tmp/export/hero"),
+    ...     batch.Job("/scenes/extra.ma", "root_joint", "/tmp/export/extra"),
+    ... ]
+    >>> summary = batch.export_rigs(jobs, processes=8, report="/tmp/export/report.json")
+
+"""
+
+# IMPORT STANDARD LIBRARIES
+import collections
+import json
+import logging
+import multiprocessing
+import os
+import subprocess
+import sys
+import threading
+import timeit
+from multiprocessing import pool as pool_
+
+LOGGER = logging.getLogger(__name__)
+_PACKAGE_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+_USD_PLUGIN = "pxrUsd"
+
+Job = collections.namedtuple(
+    "Job", "scene node folder root_path animation_path times"
+)
+Job.__new__.__defaults__ = ("/SkeletonRoot", "/SkeletonAnimation", None)
+
+
+def _get_environment():
+    """dict[str, str]: Make sure that every worker can import this package."""
+    environment = dict(os.environ)
+    paths = [_PACKAGE_ROOT]
+
+    if environment.get("PYTHONPATH"):
+        paths.append(environment["PYTHONPATH"])
+
+    environment["PYTHONPATH"] = os.pathsep.join(paths)
+
+    return environment
+
+
+def _communicate(process, timeout=None):
+    """Wait for some process to exit and kill it if it takes too long.
+
+    `subprocess.Popen.communicate` has no timeout in Python 2 so the
+    process is killed from a timer, instead.
+
+    Args:
+        process (`subprocess.Popen`): A process whose output is piped.
+        timeout (float, optional): The most seconds to wait. Default: wait forever.
+
+    Returns:
+        tuple[str, bool]: The output of the process and if it was killed.
+
+    """
+    if timeout is None:
+        output, _ = process.communicate()
+
+        return (output, False)
+
+    expired = threading.Event()
+
+    def _kill():
+        expired.set()
+
+        try:
+            process.kill()
+        except OSError:  # The process already exited
+            pass
+
+    timer = threading.Timer(timeout, _kill)
+    timer.start()
+
+    try:
+        output, _ = process.communicate()
+    finally:
+        timer.cancel()
+
+    return (output, expired.is_set())
+
+
+def _run_job(arguments):
+    """Export one rig in a new mayapy process and try again if it fails.
+
+    Args:
+        arguments (tuple[`Job`, str, int, dict[str, str], float or NoneType]):
+            The rig to export, the mayapy executable to export with, the
+            number of times to retry a failed export, the environment
+            of the worker process and the most seconds that each
+            attempt may take.
+
+    Returns:
+        dict[str, object]: A description of how the export went.
+
+    """
+    job, mayapy, retries, environment, timeout = arguments
+    command = [
+        mayapy,
+        "-m",
+        "convert_maya_to_usdskel.batch",
+        json.dumps(job._asdict()),
+    ]
+    start = timeit.default_timer()
+    attempts = 0
+    returncode = None
+    error = ""
+
+    while attempts <= retries:
+        attempts += 1
+
+        try:
+            process = subprocess.Popen(
+                command,
+                env=environment,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.STDOUT,
+                universal_newlines=True,
+            )
+        except OSError as error_:
+            # A missing mayapy fails the same way every time so there's no retry
+            returncode = None
+            error = 'mayapy "{mayapy}" could not start. {error_}'.format(
+                mayapy=mayapy, error_=error_
+            )
+
+            break
+
+        output, expired = _communicate(process, timeout=timeout)
+        returncode = process.returncode
+
+        if returncode == 0:
+            error = ""
+
+            break
+
+        if expired:
+            error = 'Export took longer than "{timeout}" seconds.\n{output}'.format(
+                timeout=timeout, output=output
+            )
+        else:
+            error = output or 'mayapy exited with code "{returncode}".'.format(
+                returncode=returncode
+            )
+
+        LOGGER.warning(
+            'Scene "%s" failed to export on attempt "%s".', job.scene, attempts
+        )
+
+    return {
+        "scene": job.scene,
+        "node": job.node,
+        "folder": job.folder,
+        "attempts": attempts,
+        "seconds": timeit.default_timer() - start,
+        "returncode": returncode,
+        "succeeded": returncode == 0,
+        "error": error,
+    }
+
+
+def export_rig(job):
+    """Export one rig, inside of the current (mayapy) process.
+
+    Args:
+        job (`Job`): The Maya scene to open and the rig in that scene to export.
+
+    """
+    from maya import standalone
+
+    standalone.initialize()
+
+    try:
+        from maya import cmds
+
+        from . import converter
+
+        cmds.loadPlugin(_USD_PLUGIN, quiet=True)
+        cmds.file(job.scene, open=True, force=True)
+        converter.write_rig_as_usdskel(
+            job.node,
+            job.root_path,
+            job.animation_path,
+            job.folder,
+            times=job.times,
+        )
+    finally:
+        standalone.uninitialize()
+
+
+def export_rigs(
+    jobs, processes=None, retries=1, mayapy=None, report=None, timeout=None
+):
+    """Export every rig in its own mayapy process, several processes at a time.
+
+    Args:
+        jobs (iter[`Job`]):
+            The rigs to export. Every rig must export to a different
+            folder so that its skeleton, animation and mesh Layers
+            don't overwrite another rig's Layers.
+        processes (int, optional):
+            The number of rigs to export at the same time. If no number
+            is given, one rig is exported per-CPU core.
+        retries (int, optional):
+            The number of times to try to export a rig again, if it fails.
+            Default: 1.
+        mayapy (str, optional):
+            The mayapy executable to export with. If no executable is
+            given, the `MAYAPY` environment variable is used or, if
+            that isn't defined, "mayapy" must be on the user's PATH.
+        report (str, optional):
+            If given, the summary of every export is written to this JSON file.
+        timeout (float, optional):
+            The most seconds that one attempt to export a rig may take.
+            An attempt which takes longer is killed and counts as a
+            failure. If no number is given, attempts never time out.
+
+    Raises:
+        ValueError: If 2+ jobs export to the same folder.
+
+    Returns:
+        dict[str, object]:
+            The number of succeeded and failed exports, the total time
+            and a description of every export, in the same order as `jobs`.
+
+    """
+    jobs = list(jobs)
+    folders = collections.Counter(os.path.normpath(job.folder) for job in jobs)
+    duplicates = sorted(folder for folder, count in folders.items() if count > 1)
+
+    if duplicates:
+        raise ValueError(
+            'Folders "{duplicates}" are used by more than one job.'.format(
+                duplicates=duplicates
+            )
+        )
+
+    mayapy = mayapy or os.environ.get("MAYAPY", "mayapy")
+    processes = min(processes or multiprocessing.cpu_count(), len(jobs)) or 1
+    environment = _get_environment()
+    start = timeit.default_timer()
+    pool = pool_.ThreadPool(processes)
+
+    try:
+        results = pool.map(
+            _run_job, [(job, mayapy, retries, environment, timeout) for job in jobs]
+        )
+    finally:
+        pool.close()
+        pool.join()
+
+    failed = [result for result in results if not result["succeeded"]]
+
+    for result in failed:
+        LOGGER.error('Scene "%s" failed to export:\n%s', result["scene"], result["error"])
+
+    summary = {
+        "succeeded": len(results) - len(failed),
+        "failed": len(failed),
+        "seconds": timeit.default_timer() - start,
+        "jobs": results,
+    }
+
+    if report:
+        with open(report, "w") as handler:
+            json.dump(summary, handler, indent=4, sort_keys=True)
+
+    return summary
+
+
+def main():
+    """Export the rig that's described by the JSON command-line argument."""
+    job = json.loads(sys.argv[1])
+
+    if job.get("times"):
+        job["times"] = tuple(job["times"])
+
+    export_rig(Job(**job))
+
+
+if __name__ == "__main__":
+    main()
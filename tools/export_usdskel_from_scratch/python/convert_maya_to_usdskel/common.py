@@ -3,9 +3,49 @@
 
 """DCC-agnostic functions that are generally useful."""
 
+import itertools
+
 STEP = 1.0
 
 
+def iter_chunks(items, size=None):
+    """Split some items into lists of at most `size` items.
+
+    Args:
+        items (iter[object]): The values to split.
+        size (int, optional):
+            The maximum number of items in each chunk. If no size is
+            given, every item is returned in a single chunk.
+
+    Raises:
+        ValueError: If `size` is less than 1.
+
+    Yields:
+        list[object]: Each chunk of `items`, in order.
+
+    """
+    if size is None:
+        items = list(items)
+
+        if items:
+            yield items
+
+        return
+
+    if size < 1:
+        raise ValueError('Size "{size}" must be at least 1.'.format(size=size))
+
+    iterator = iter(items)
+
+    while True:
+        chunk = list(itertools.islice(iterator, size))
+
+        if not chunk:
+            return
+
+        yield chunk
+
+
 def frange(start, stop=None, step=STEP):
     """Create a range of values like Python's built-in "range" function.
 
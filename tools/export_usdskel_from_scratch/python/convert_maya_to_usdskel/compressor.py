@@ -0,0 +1,298 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""Remove redundant time samples from an exported UsdSkel animation.
+
+Every joint is normally written at every frame, even if the joint
+doesn't move or moves in a straight line. This module removes those
+samples, up to some tolerance:
+
+- Joints that never move and match their rest transform are removed
+  from the animation. UsdSkel falls back to the Skeleton's
+  restTransforms for any joint that an animation doesn't list.
+- Channels (translations, rotations or scales) that never change are
+  written as a single default value.
+- Any sample that interpolating its neighbors reproduces is removed.
+
+Example:
+    >>> from convert_maya_to_usdskel import compressor
+    >>> compressor.compress_animation(animation, tolerance=1e-4)
+
+"""
+
+# IMPORT THIRD-PARTY LIBRARIES
+from pxr import Sdf, UsdSkel
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+def _get_samples(attribute):
+    """Read every time sample of some array attribute.
+
+    Args:
+        attribute (`pxr.Usd.Attribute`): An attribute with array values, e.g. "translations".
+
+    Returns:
+        tuple[list[float], list[`pxr.Vt.Array`], `numpy.ndarray`]:
+            The times, the original values and the values as one
+            array, shaped (times, joints, components).
+
+    """
+    times = attribute.GetTimeSamples()
+    values = [attribute.Get(time_code) for time_code in times]
+    data = numpy.array([_to_numpy(value) for value in values])
+
+    return (times, values, data)
+
+
+def _get_static_joints(channels, rest_channels, tolerance):
+    """Find every joint which never moves away from its rest transform.
+
+    Args:
+        channels (list[`numpy.ndarray`]):
+            The translations, rotations and scales of every joint, each
+            shaped (times, joints, components).
+        rest_channels (list[`numpy.ndarray`]):
+            The rest translations, rotations and scales of every joint,
+            each shaped (joints, components).
+        tolerance (float): The largest difference that is still "the same".
+
+    Returns:
+        `numpy.ndarray`: A bool for every joint. True means the joint is static.
+
+    """
+    static = None
+
+    for data, rest in zip(channels, rest_channels):
+        matches = (numpy.abs(data - rest[numpy.newaxis]) <= tolerance).all(axis=(0, 2))
+
+        if data.shape[-1] == 4:
+            # A quaternion and its negation are the same rotation
+            matches |= (numpy.abs(data + rest[numpy.newaxis]) <= tolerance).all(
+                axis=(0, 2)
+            )
+
+        static = matches if static is None else static & matches
+
+    return static
+
+
+def _interpolate(first, last, weights, rotation):
+    """Interpolate between two samples like USD does.
+
+    Args:
+        first (`numpy.ndarray`): The earlier sample, shaped (joints, components).
+        last (`numpy.ndarray`): The later sample, shaped (joints, components).
+        weights (`numpy.ndarray`): The 0-1 position of each in-between sample.
+        rotation (bool): If True, spherically interpolate quaternions.
+
+    Returns:
+        `numpy.ndarray`: Every in-between sample, shaped (weights, joints, components).
+
+    """
+    weights = weights[:, numpy.newaxis, numpy.newaxis]
+
+    if not rotation:
+        return first + (last - first) * weights
+
+    dots = (first * last).sum(axis=-1, keepdims=True)
+    last = numpy.where(dots < 0, -last, last)
+    angles = numpy.arccos(numpy.clip(numpy.abs(dots), -1.0, 1.0))
+    sines = numpy.sin(angles)
+    small = sines < 1e-6
+    safe = numpy.where(small, 1.0, sines)
+
+    first_weights = numpy.where(
+        small, 1 - weights, numpy.sin((1 - weights) * angles) / safe
+    )
+    last_weights = numpy.where(small, weights, numpy.sin(weights * angles) / safe)
+
+    return first * first_weights + last * last_weights
+
+
+def _get_redundant_times(times, data, tolerance, rotation):
+    """Find every sample that interpolating its kept neighbors reproduces.
+
+    Args:
+        times (list[float]): The time of every sample.
+        data (`numpy.ndarray`): Every sample, shaped (times, joints, components).
+        tolerance (float): The largest difference that is still "the same".
+        rotation (bool): If True, `data` are quaternions.
+
+    Returns:
+        set[int]: The indices of every sample that can be removed.
+
+    """
+    times = numpy.asarray(times, dtype=numpy.float64)
+    redundant = set()
+    anchor = 0
+
+    for index in range(1, len(times) - 1):
+        # Check if every sample since `anchor` can be skipped, if `index` is skipped too
+        between = numpy.arange(anchor + 1, index + 1)
+        weights = (times[between] - times[anchor]) / (times[index + 1] - times[anchor])
+        expected = _interpolate(data[anchor], data[index + 1], weights, rotation)
+        difference = numpy.abs(expected - data[between]).max(axis=-1)
+
+        if rotation:
+            # A quaternion and its negation are the same rotation. The
+            # sign must be picked once per-quaternion, not per-component
+            #
+            difference = numpy.minimum(
+                difference, numpy.abs(expected + data[between]).max(axis=-1)
+            )
+
+        if (difference <= tolerance).all():
+            redundant.add(index)
+        else:
+            anchor = index
+
+    return redundant
+
+
+def _to_numpy(values):
+    """Convert a Vt array of vectors or quaternions into a (count, components) array.
+
+    Args:
+        values (`pxr.Vt.Array`): e.g. A `pxr.Vt.Vec3fArray` or `pxr.Vt.QuatfArray`.
+
+    Returns:
+        `numpy.ndarray`: The converted values, as 64-bit floats.
+
+    """
+    try:
+        data = numpy.array(values, dtype=numpy.float64)
+    except (TypeError, ValueError):
+        data = None
+
+    if data is not None and data.ndim == 2:
+        return data
+
+    # Older USD versions (and quaternions) don't support the buffer protocol
+    if len(values) and hasattr(values[0], "GetReal"):
+        return numpy.array(
+            [(value.GetReal(),) + tuple(value.GetImaginary()) for value in values],
+            dtype=numpy.float64,
+        )
+
+    return numpy.array([tuple(value) for value in values], dtype=numpy.float64)
+
+
+def _is_constant(data, tolerance):
+    """bool: Check if every sample in `data` is the same as the first sample."""
+    return bool((numpy.abs(data - data[:1]) <= tolerance).all())
+
+
+def compress_animation(
+    animation, tolerance=1e-5, rest_transforms=None, use_defaults=True
+):
+    """Remove every redundant time sample from some UsdSkel animation.
+
+    Every change is written to the current edit target of the
+    animation's stage.
+
+    Args:
+        animation (`pxr.UsdSkel.Animation`): The animation to compress.
+        tolerance (float, optional):
+            The largest difference of any translation, rotation or
+            scale component which is still considered "the same".
+            Default: 1e-5.
+        rest_transforms (`pxr.Vt.Matrix4dArray`, optional):
+            The local-space rest transform of every joint in `animation`.
+            If given, joints which never move from their rest
+            transform are removed from `animation`.
+        use_defaults (bool, optional):
+            If True, channels that never change are written as a default
+            value. If False, they keep their first time sample, instead.
+            Use False for value clip Layers because value clips don't
+            provide default values. Default is True.
+
+    Raises:
+        EnvironmentError: If NumPy cannot be imported.
+
+    Returns:
+        dict[str, object]:
+            The removed joints and, for each channel, the number of time
+            samples before and after compression.
+
+    """
+    if numpy is None:
+        raise EnvironmentError("NumPy is required to compress animation.")
+
+    attributes = [
+        animation.GetTranslationsAttr(),
+        animation.GetRotationsAttr(),
+        animation.GetScalesAttr(),
+    ]
+    samples = [_get_samples(attribute) for attribute in attributes]
+    joints = list(animation.GetJointsAttr().Get() or [])
+    kept = list(range(len(joints)))
+
+    if rest_transforms is not None and all(len(times) for times, _, _ in samples):
+        rest_channels = [
+            _to_numpy(values) for values in UsdSkel.DecomposeTransforms(rest_transforms)
+        ]
+        static = _get_static_joints(
+            [data for _, _, data in samples], rest_channels, tolerance
+        )
+        kept = [index for index in kept if not static[index]]
+
+    stage = animation.GetPrim().GetStage()
+    edit_target = stage.GetEditTarget()
+    layer = edit_target.GetLayer()
+    removing_joints = len(kept) != len(joints)
+    defaults = []
+    report = {
+        "removed_joints": [
+            joint for index, joint in enumerate(joints) if index not in kept
+        ]
+    }
+
+    if removing_joints:
+        animation.GetJointsAttr().Set([joints[index] for index in kept])
+
+    with Sdf.ChangeBlock():
+        for attribute, (times, values, data) in zip(attributes, samples):
+            if not times:
+                continue
+
+            path = edit_target.MapToSpecPath(attribute.GetPath())
+            type_ = type(values[0])
+            data = data[:, kept]
+
+            if _is_constant(data, tolerance):
+                removed = set(range(1, len(times)))
+
+                if use_defaults:
+                    removed.add(0)
+            else:
+                removed = _get_redundant_times(
+                    times, data, tolerance, rotation=data.shape[-1] == 4
+                )
+
+            for index, time_code in enumerate(times):
+                if index in removed:
+                    layer.EraseTimeSample(path, time_code)
+                elif removing_joints:
+                    layer.SetTimeSample(
+                        path, time_code, type_([values[index][joint] for joint in kept])
+                    )
+
+            if len(removed) == len(times):
+                value = values[0]
+
+                if removing_joints:
+                    value = type_([value[joint] for joint in kept])
+
+                defaults.append((attribute, value))
+
+            report[attribute.GetName()] = (len(times), len(times) - len(removed))
+
+    # Usd API calls which may create specs aren't safe inside of a change block
+    for attribute, value in defaults:
+        attribute.Set(value)
+
+    return report
@@ -16,15 +16,76 @@ Example:
 """
 
 import functools
+import glob
+import hashlib
 import logging
 import os
 
 from maya import cmds
 from pxr import Gf, Sdf, Usd, UsdGeom, UsdSkel, Vt
 
-from . import animator, common, helper, mesher, skinner
+from . import animator, common, compressor, helper, mesher, profiler, skinner
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
 
 LOGGER = logging.getLogger(__name__)
+_WINDOWS_KEY = "convert_maya_to_usdskel:windows"
+
+
+def _create_layer(path):
+    """Create an empty Layer at `path`, even if a Layer at `path` is already open.
+
+    `pxr.Sdf.Layer.CreateNew` fails if `path` is still open, e.g. when
+    a rig is exported to the same folder twice, in the same session.
+
+    Args:
+        path (str): The absolute path on-disk where the Layer will be saved.
+
+    Returns:
+        `pxr.Sdf.Layer`: The created (or cleared) Layer.
+
+    """
+    layer = Sdf.Layer.Find(path)
+
+    if not layer:
+        return Sdf.Layer.CreateNew(path)
+
+    layer.Clear()
+
+    return layer
+
+
+def _erase_time_samples(attributes, start, end):
+    """Remove every time sample from `start` to `end` (inclusive) of some attributes."""
+    for attribute in attributes:
+        spec = attribute.GetStage().GetEditTarget().GetPropertySpecForScenePath(
+            attribute.GetPath()
+        )
+
+        if not spec:
+            continue
+
+        layer = spec.layer
+
+        for time_code in layer.ListTimeSamplesForPath(spec.path):
+            if start <= time_code <= end:
+                layer.EraseTimeSample(spec.path, time_code)
+
+
+def _get_window_key(time_code):
+    """str: Get the customData key of the window which starts at some time."""
+    return str(float(time_code))
+
+
+def _get_matrices_hash(world_matrices):
+    """str: Hash some sampled matrices, ignoring floating-point noise."""
+    # Adding 0.0 turns -0.0 into 0.0, so that both hash the same
+    rounded = numpy.ascontiguousarray(numpy.round(world_matrices, 6) + 0.0)
+
+    return hashlib.sha1(rounded.tobytes()).hexdigest()
 
 
 def _setup_animation_range_from_nodes(stage, nodes):
@@ -87,6 +148,10 @@ def _setup_animation(
 ):
     """Write joint animation to USD and bind the animation to a skeleton.
 
+    Important:
+        `joints` must already be authored onto `animation`. See
+        :func:`_setup_animation_joints`.
+
     Reference:
         https://graphics.pixar.com/usd/docs/api/_usd_skel__a_p_i__intro.html#UsdSkel_API_WritingSkels
 
@@ -113,17 +178,6 @@ def _setup_animation(
             before it is used to compute a local-space joint transform.
 
     """
-    animation.GetPrim().SetMetadata(
-        "comment",
-        "local-space joint transformations that match the `joints` attribute.",
-    )
-
-    joints_attribute = animation.CreateJointsAttr(joints)
-    joints_attribute.SetMetadata(
-        "comment",
-        "This list of joints contains every joint plus the original Maya root joint.",
-    )
-
     for time_code in time_codes:
         joint_world_space_transforms = Vt.Matrix4dArray(joints_transforms[time_code])
 
@@ -148,6 +202,97 @@ def _setup_animation(
             )
 
 
+def _setup_animation_in_bulk(animation, time_codes, joints, world_matrices, topology):
+    """Write joint animation to USD, computing every time-code at once.
+
+    This function writes the same animation as :func:`_setup_animation`
+    but local-space transforms are computed for every time-code in a
+    single NumPy operation and then written as translations, rotations
+    and scales directly into the edit target's Layer.
+
+    Important:
+        `joints` must already be authored onto `animation`. See
+        :func:`_setup_animation_joints`.
+
+    Args:
+        animation (`pxr.UsdSkel.Animation`):
+            The object that will get all of the animation data applied
+            to it in this function.
+        time_codes (list[float or int]):
+            The time-codes of every sample in `world_matrices`.
+        joints (list[str]):
+            The ordered-list of parent<->child joints that will be used
+            to compute the local-space joint transformations. This
+            parameter is the base of `topology`.
+        world_matrices (`numpy.ndarray`):
+            The flat, world-space transforms of every joint in `joints`
+            for-each time-code in `time_codes`, shaped (times, joints, 16).
+        topology (`pxr.UsdSkel.Topology`):
+            A description of the joint hierarchy that was created using
+            `joints` as its input.
+
+    Raises:
+        ValueError: If `world_matrices` doesn't match `time_codes` and `joints`.
+
+    """
+    joint_count = len(joints)
+    expected = (len(time_codes), joint_count, 16)
+
+    if world_matrices.shape != expected:
+        raise ValueError(
+            'Transforms shape "{shape}" must be "{expected}".'.format(
+                shape=world_matrices.shape, expected=expected
+            )
+        )
+
+    local_matrices = animator.get_local_matrices(
+        world_matrices, topology.GetParentIndices()
+    )
+    translations, rotations, scales = UsdSkel.DecomposeTransforms(
+        _to_matrix_array(local_matrices.reshape(-1, 4, 4))
+    )
+
+    stage = animation.GetPrim().GetStage()
+    edit_target = stage.GetEditTarget()
+    layer = edit_target.GetLayer()
+    channels = [
+        (edit_target.MapToSpecPath(attribute.GetPath()), values)
+        for attribute, values in (
+            (animation.CreateTranslationsAttr(), translations),
+            (animation.CreateRotationsAttr(), rotations),
+            (animation.CreateScalesAttr(), scales),
+        )
+    ]
+
+    with Sdf.ChangeBlock():
+        for index, time_code in enumerate(time_codes):
+            start = index * joint_count
+            end = start + joint_count
+
+            for path, values in channels:
+                layer.SetTimeSample(path, time_code, values[start:end])
+
+
+def _setup_animation_joints(animation, joints):
+    """Describe `animation` and author the joints that its transforms are for.
+
+    Args:
+        animation (`pxr.UsdSkel.Animation`): The object to author onto.
+        joints (list[str]): The ordered-list of parent<->child joints.
+
+    """
+    animation.GetPrim().SetMetadata(
+        "comment",
+        "local-space joint transformations that match the `joints` attribute.",
+    )
+
+    joints_attribute = animation.CreateJointsAttr(joints)
+    joints_attribute.SetMetadata(
+        "comment",
+        "This list of joints contains every joint plus the original Maya root joint.",
+    )
+
+
 def _setup_cached_extents_hints(stage, root_path, meshes, times):
     """Add bounding box information to the a UsdSkelRoot Prim.
 
@@ -175,6 +320,13 @@ def _setup_cached_extents_hints(stage, root_path, meshes, times):
             bounding box information for.
 
     """
+    if numpy is not None:
+        _write_extents_hints(
+            stage, root_path, times, mesher.get_overall_bounding_boxes(meshes, times)
+        )
+
+        return
+
     override = stage.GetPrimAtPath(root_path)
 
     if not override.IsValid():
@@ -188,6 +340,41 @@ def _setup_cached_extents_hints(stage, root_path, meshes, times):
         UsdGeom.ModelAPI(override).SetExtentsHint(bounding_box, time_code)
 
 
+def _setup_extents_hints_from_animation(
+    stage, root_path, times, joint_extents, padding
+):
+    """Add bounding box information to a UsdSkelRoot Prim without querying Maya.
+
+    The bounding box of each time is the bounding box of every joint's
+    position, grown by `padding` so that it also surrounds the skinned
+    meshes.
+
+    Args:
+        stage (`pxr.Usd.Stage`):
+            The USD object that will be used to get/create the `root_path` Prim.
+        root_path (str):
+            The absolute USD namespace location to the UsdSkelRoot Prim
+            that we will add an extents hint to.
+        times (list[float or int]):
+            The time-codes of every bounding box in `joint_extents`.
+        joint_extents (`numpy.ndarray`):
+            The minimum and maximum world-space position of every
+            joint, for each time, shaped (times, 2, 3).
+            See :func:`animator.get_position_extents`.
+        padding (float):
+            The distance to grow each joint bounding box by.
+            See :func:`_get_skinning_padding`.
+
+    """
+    if not times:
+        # There's no animation so there's nothing to bound
+        return
+
+    extents = joint_extents + numpy.array([-padding, padding])[:, numpy.newaxis]
+
+    _write_extents_hints(stage, root_path, times, extents)
+
+
 def _setup_animation_connections(stage, root_path, animation_path):
     """Connect an existing SkeletonAnimation Prim to a Prim on a stage.
 
@@ -461,6 +648,62 @@ def _setup_skeleton(root, path):
     return skeleton
 
 
+def _get_skinning_padding(bindings, bind_transforms):
+    """Find how far any skinned vertex is from the joints that influence it.
+
+    Args:
+        bindings (iter[`pxr.UsdSkel.BindingAPI`]): The skinned meshes to check.
+        bind_transforms (`pxr.Vt.Matrix4dArray`):
+            The world-space transform of every joint at bind-time.
+
+    Returns:
+        float: The largest distance, at bind-time, between a vertex and one of its joints.
+
+    """
+    joint_positions = numpy.array(bind_transforms).reshape(-1, 4, 4)[:, 3, :3]
+    padding = 0.0
+
+    for binding in bindings:
+        points = UsdGeom.Mesh(binding.GetPrim()).GetPointsAttr().Get()
+        primvar = binding.GetJointIndicesPrimvar()
+
+        if not points or not primvar:
+            continue
+
+        points = numpy.array(points, dtype=numpy.float64)
+        points = numpy.hstack((points, numpy.ones((len(points), 1))))
+        geometry_transform = numpy.array(
+            binding.GetGeomBindTransformAttr().Get(), dtype=numpy.float64
+        )
+        points = points.dot(geometry_transform)[:, :3]
+        indices = numpy.array(primvar.Get()).reshape(len(points), -1)
+        distances = numpy.linalg.norm(
+            points[:, numpy.newaxis] - joint_positions[indices], axis=2
+        )
+        padding = max(padding, float(distances.max()))
+
+    return padding
+
+
+def _to_matrix_array(matrices):
+    """Convert a NumPy array of 4x4 matrices into a `pxr.Vt.Matrix4dArray`.
+
+    Args:
+        matrices (`numpy.ndarray`): Some matrices, shaped (count, 4, 4).
+
+    Returns:
+        `pxr.Vt.Matrix4dArray`: The converted matrices.
+
+    """
+    try:
+        return Vt.Matrix4dArray.FromNumpy(matrices)
+    except AttributeError:
+        # Older USD versions can't convert directly from NumPy
+        return Vt.Matrix4dArray(
+            [Gf.Matrix4d(*matrix) for matrix in matrices.reshape(-1, 16).tolist()]
+        )
+
+
 def _validate_topology(paths):
     """Check if the order of `paths` will create a correct UsdSkelSkeleton.
 
@@ -488,7 +731,260 @@ def _validate_topology(paths):
     return topology
 
 
-def write_rig_as_usdskel(node, root_path, animation_path, folder, times=None):
+def _write_animation(
+    animation, times, joints, nodes, topology, chunk_size=None, store_windows=False
+):
+    """Sample the joint animation of a Maya skeleton and write it to USD.
+
+    Args:
+        animation (`pxr.UsdSkel.Animation`): The object to write the animation onto.
+        times (list[float or int]): Every time-code to sample and write.
+        joints (list[str]): The USD joint paths, in topology-order.
+        nodes (list[str]): The Maya joints that match each path in `joints`.
+        topology (`pxr.UsdSkel.Topology`): A description of the `joints` hierarchy.
+        chunk_size (int, optional):
+            If given, only this many frames are sampled and held in
+            memory at once. Each chunk is written and released before
+            the next chunk is sampled. If no size is given, every frame
+            is sampled before anything is written.
+        store_windows (bool, optional):
+            If True, a hash of each chunk is stored in the customData of
+            `animation` so that :func:`update_rig_animation` can skip
+            unchanged chunks later. Hashing queries every animation
+            curve of the skeleton, for every chunk. Default is False.
+
+    Returns:
+        `numpy.ndarray` or NoneType:
+            The minimum and maximum world-space position of every joint,
+            for each time, shaped (times, 2, 3). If NumPy cannot be
+            imported, None is returned.
+
+    """
+    _setup_animation_joints(animation, joints)
+    joint_extents = []
+    curves = animator.get_animation_curves(nodes) if store_windows else []
+    windows = {}
+
+    for chunk in common.iter_chunks(times, chunk_size):
+        if numpy is None:
+            with profiler.phase("sampling"):
+                transforms = animator.get_joint_world_space_transforms(nodes, chunk)
+
+            with profiler.phase("authoring"):
+                _setup_animation(
+                    animation, chunk, joints, transforms, topology, len(joints)
+                )
+
+            continue
+
+        with profiler.phase("sampling"):
+            world_matrices = animator.get_node_matrices_at_times(nodes, chunk, "world")
+
+        with profiler.phase("authoring"):
+            _setup_animation_in_bulk(animation, chunk, joints, world_matrices, topology)
+
+        joint_extents.append(animator.get_position_extents(world_matrices))
+
+        if not store_windows:
+            continue
+
+        with profiler.phase("hashing"):
+            windows[_get_window_key(chunk[0])] = {
+                "curves": animator.get_curves_hash(curves, chunk[0], chunk[-1]),
+                "matrices": _get_matrices_hash(world_matrices),
+            }
+
+    if not joint_extents:
+        return None
+
+    if store_windows:
+        # These hashes let `update_rig_animation` skip unchanged frames, later
+        animation.GetPrim().SetCustomDataByKey(
+            _WINDOWS_KEY, {"window_size": chunk_size or len(times), "windows": windows}
+        )
+
+    return numpy.concatenate(joint_extents)
+
+
+def _write_animation_clips(
+    animation,
+    times,
+    joints,
+    nodes,
+    topology,
+    clip_size,
+    chunk_size=None,
+    compression_tolerance=None,
+):
+    """Write joint animation into value clip Layers, each holding `clip_size` frames.
+
+    Each clip Layer is written next to the Layer of `animation`, in an
+    "animation_clips" folder. `animation` only gets its joints and the
+    value clip metadata which points to each clip Layer. A manifest
+    Layer which lists every animated attribute is written, too.
+
+    Reference:
+        https://graphics.pixar.com/usd/docs/api/class_usd_clips_a_p_i.html
+
+    Args:
+        animation (`pxr.UsdSkel.Animation`):
+            The object that will use the written clips.
+        times (list[float or int]): Every time-code to sample and write.
+        joints (list[str]): The USD joint paths, in topology-order.
+        nodes (list[str]): The Maya joints that match each path in `joints`.
+        topology (`pxr.UsdSkel.Topology`): A description of the `joints` hierarchy.
+        clip_size (int): The number of frames to write into each clip Layer.
+        chunk_size (int, optional):
+            The number of frames to sample at once, within each clip.
+            If no size is given, each clip is sampled at once.
+        compression_tolerance (float, optional):
+            If given, redundant time samples are removed from each clip
+            Layer. See :func:`compressor.compress_animation`.
+
+    Returns:
+        `numpy.ndarray` or NoneType:
+            The minimum and maximum world-space position of every joint,
+            for each time, shaped (times, 2, 3). If NumPy cannot be
+            imported, None is returned.
+
+    """
+    layer = animation.GetPrim().GetStage().GetRootLayer()
+    directory = os.path.dirname(layer.realPath)
+    clips_directory = os.path.join(directory, "animation_clips")
+
+    if not os.path.isdir(clips_directory):
+        os.makedirs(clips_directory)
+
+    # A previous export may have written more clips than this export will
+    for path_ in glob.glob(os.path.join(clips_directory, "animation.*.usda")):
+        os.remove(path_)
+
+    path = animation.GetPath()
+    asset_paths = []
+    active = []
+    clip_times = []
+    joint_extents = []
+
+    for index, chunk in enumerate(common.iter_chunks(times, clip_size)):
+        clip_stage = Usd.Stage.Open(
+            _create_layer(
+                os.path.join(
+                    clips_directory, "animation.{index:04d}.usda".format(index=index)
+                )
+            )
+        )
+        clip_stage.SetStartTimeCode(chunk[0])
+        clip_stage.SetEndTimeCode(chunk[-1])
+        clip = UsdSkel.Animation.Define(clip_stage, path)
+        extents = _write_animation(
+            clip, chunk, joints, nodes, topology, chunk_size=chunk_size
+        )
+
+        if compression_tolerance is not None:
+            # Value clips can't provide default values so constant
+            # channels keep a single time sample, instead
+            #
+            with profiler.phase("compression"):
+                compressor.compress_animation(
+                    clip, tolerance=compression_tolerance, use_defaults=False
+                )
+
+        clip_stage.Save()
+
+        if extents is not None:
+            joint_extents.append(extents)
+
+        asset_paths.append(
+            Sdf.AssetPath(
+                "./" + os.path.relpath(clip_stage.GetRootLayer().realPath, directory)
+            )
+        )
+        active.append((chunk[0], index))
+        # Each clip's samples are written at their original times
+        clip_times.append((chunk[0], chunk[0]))
+
+    if times:
+        clip_times.append((times[-1], times[-1]))
+
+    manifest = _create_layer(os.path.join(clips_directory, "manifest.usda"))
+    prim = Sdf.CreatePrimInLayer(manifest, path)
+    prim.specifier = Sdf.SpecifierOver
+
+    for attribute, type_name in (
+        (animation.GetTranslationsAttr(), Sdf.ValueTypeNames.Float3Array),
+        (animation.GetRotationsAttr(), Sdf.ValueTypeNames.QuatfArray),
+        (animation.GetScalesAttr(), Sdf.ValueTypeNames.Half3Array),
+    ):
+        Sdf.AttributeSpec(prim, attribute.GetName(), type_name)
+
+    manifest.Save()
+
+    _setup_animation_joints(animation, joints)
+    clips = Usd.ClipsAPI(animation.GetPrim())
+    clips.SetClipPrimPath(str(path))
+    clips.SetClipAssetPaths(asset_paths)
+    clips.SetClipActive(active)
+    clips.SetClipTimes(clip_times)
+    clips.SetClipManifestAssetPath(
+        "./" + os.path.relpath(manifest.realPath, directory)
+    )
+
+    if not joint_extents:
+        return None
+
+    return numpy.concatenate(joint_extents)
+
+
+def _write_extents_hints(stage, root_path, times, extents):
+    """Author the extentsHint of a UsdSkelRoot Prim for every time, in one batch.
+
+    Args:
+        stage (`pxr.Usd.Stage`):
+            The USD object that will be used to get/create the `root_path` Prim.
+        root_path (str): The absolute USD namespace location to the UsdSkelRoot Prim.
+        times (list[float or int]): The time of each bounding box in `extents`.
+        extents (`numpy.ndarray`):
+            The minimum and maximum point of each time, shaped (times, 2, 3).
+
+    """
+    override = stage.GetPrimAtPath(root_path)
+
+    if not override.IsValid():
+        override = stage.OverridePrim(root_path)
+
+    attribute = UsdGeom.ModelAPI(override).GetExtentsHintAttr()
+
+    if not attribute:
+        attribute = override.CreateAttribute(
+            UsdGeom.Tokens.extentsHint, Sdf.ValueTypeNames.Float3Array, False
+        )
+
+    edit_target = stage.GetEditTarget()
+    layer = edit_target.GetLayer()
+    path = edit_target.MapToSpecPath(attribute.GetPath())
+
+    with Sdf.ChangeBlock():
+        for time_code, (minimum, maximum) in zip(times, extents.tolist()):
+            layer.SetTimeSample(
+                path,
+                time_code,
+                Vt.Vec3fArray([Gf.Vec3f(*minimum), Gf.Vec3f(*maximum)]),
+            )
+
+
+def write_rig_as_usdskel(
+    node,
+    root_path,
+    animation_path,
+    folder,
+    times=None,
+    extents_source="maya",
+    extents_padding=None,
+    chunk_size=None,
+    clip_size=None,
+    compression_tolerance=None,
+    store_windows=False,
+):
     """Write an animated USD Skeleton to-disk.
 
     If no time range is given then a start/end range is found by looking
@@ -515,8 +1011,60 @@ def write_rig_as_usdskel(node, root_path, animation_path, folder, times=None):
             The start and end frames of animation to record. If no
             start/end is given then the times will be automatically
             found using animation on the Skeleton.
+        extents_source (str, optional):
+            Where the extentsHint of the UsdSkelRoot comes from.
+            "maya" queries the bounding box of every skinned mesh, for
+            every frame. "animation" derives each bounding box from the
+            exported joint animation and skinning, without querying
+            Maya. Default: "maya".
+        extents_padding (float, optional):
+            If `extents_source` is "animation", grow each joint bounding
+            box by this distance. If no distance is given, it's derived
+            from the skinned meshes.
+        chunk_size (int, optional):
+            The number of frames of joint animation to sample and write
+            at once. Use this to keep memory low for long frame ranges.
+            If no size is given, every frame is sampled at once.
+        clip_size (int, optional):
+            If given, the joint animation is split into value clip
+            Layers with this many frames each, instead of being written
+            into the animation Layer. Consumers then only load the
+            frames that they need. Default: None.
+        compression_tolerance (float, optional):
+            If given, time samples which interpolation reproduces within
+            this tolerance are removed, channels that never change are
+            written once and joints that never leave their rest
+            transform are removed from the animation. Default: None.
+        store_windows (bool, optional):
+            If True, store a hash of every `chunk_size` frames so that
+            :func:`update_rig_animation` can skip frames that didn't
+            change. This makes the export slower. Value clips can't be
+            updated so this can't be used with `clip_size`. Default is False.
+
+    Raises:
+        EnvironmentError: If `extents_source` is "animation" and NumPy cannot be imported.
+        ValueError:
+            If `extents_source` isn't a valid option or if `store_windows`
+            and `clip_size` are both given.
 
     """
+    extents_sources = ("maya", "animation")
+
+    if extents_source not in extents_sources:
+        raise ValueError(
+            'Extents source "{extents_source}" is invalid. Options were, "{extents_sources}".'.format(
+                extents_source=extents_source, extents_sources=sorted(extents_sources)
+            )
+        )
+
+    if clip_size and store_windows:
+        raise ValueError(
+            "Value clip animation cannot be updated so it can't store windows."
+        )
+
+    if extents_source == "animation" and numpy is None:
+        raise EnvironmentError("NumPy is required to derive extents from animation.")
+
     if not os.path.isdir(folder):
         os.makedirs(folder)
 
@@ -529,7 +1077,9 @@ def write_rig_as_usdskel(node, root_path, animation_path, folder, times=None):
         "and mesh data go inside of here.",
     )
     skeleton = _setup_skeleton(root.GetPrim(), root_path + "/Skeleton")
-    joints, nodes = helper.get_all_joints(node)
+
+    with profiler.phase("joints"):
+        joints, nodes = helper.get_all_joints(node)
 
     topology = _validate_topology(joints)
 
@@ -551,7 +1101,9 @@ def write_rig_as_usdskel(node, root_path, animation_path, folder, times=None):
     times = list(common.frange(start, end))
 
     _setup_joints(joints, skeleton)
-    _setup_bind_transforms(nodes, skeleton, start)
+
+    with profiler.phase("bind_transforms"):
+        _setup_bind_transforms(nodes, skeleton, start)
     # XXX : Normally, you would want to add transformations onto the skeleton here.
     # but because this script __includes the root joint in `skel:joints`, that
     # root transformation is actually already being applied to the skeleton.
@@ -560,10 +1112,8 @@ def write_rig_as_usdskel(node, root_path, animation_path, folder, times=None):
     # will be double-transformed in world-space.
     #
     # _setup_root_transforms(skeleton, root_transforms)
-    _setup_rest_transforms(nodes, skeleton, start)
-    joint_world_space_transforms = animator.get_joint_world_space_transforms(
-        nodes, times
-    )
+    with profiler.phase("rest_transforms"):
+        _setup_rest_transforms(nodes, skeleton, start)
 
     animation_stage = Usd.Stage.CreateNew(os.path.join(folder, "animation.usda"))
     animation_stage.SetMetadata(
@@ -574,32 +1124,313 @@ def write_rig_as_usdskel(node, root_path, animation_path, folder, times=None):
     )
 
     animation = UsdSkel.Animation.Define(animation_stage, animation_path)
-    _setup_animation(
-        animation,
-        times,
-        joints,
-        joint_world_space_transforms,
-        topology,
-        len(joints),
-    )
+
+    with profiler.phase("animation"):
+        if clip_size:
+            joint_extents = _write_animation_clips(
+                animation,
+                times,
+                joints,
+                nodes,
+                topology,
+                clip_size,
+                chunk_size=chunk_size,
+                compression_tolerance=compression_tolerance,
+            )
+        else:
+            joint_extents = _write_animation(
+                animation,
+                times,
+                joints,
+                nodes,
+                topology,
+                chunk_size=chunk_size,
+                store_windows=store_windows,
+            )
+
+    if not clip_size and compression_tolerance is not None:
+        with profiler.phase("compression"):
+            compressor.compress_animation(
+                animation,
+                tolerance=compression_tolerance,
+                rest_transforms=skeleton.GetRestTransformsAttr().Get(),
+            )
+
     _setup_animation_connections(
         main_stage, root.GetPrim().GetPath(), animation.GetPrim().GetPath()
     )
 
-    animation_stage.Save()
+    with profiler.phase("meshes"):
+        meshes = set(
+            mesh for joint in nodes for mesh in mesher.get_connected_meshes(joint)
+        )
+        data = _setup_meshes(
+            meshes, skeleton.GetPrim(), os.path.join(folder, "meshes.usda")
+        )
+
+    if extents_source == "maya":
+        with profiler.phase("extents"):
+            _setup_cached_extents_hints(
+                main_stage, root.GetPrim().GetPath(), meshes, times
+            )
+
+    with profiler.phase("skinning"):
+        skinner.setup_skinning(data, nodes)
+
+    if extents_source == "animation":
+        with profiler.phase("extents"):
+            if extents_padding is None and times:
+                extents_padding = _get_skinning_padding(
+                    [binding for _, binding in data],
+                    skeleton.GetBindTransformsAttr().Get(),
+                )
+
+            _setup_extents_hints_from_animation(
+                main_stage,
+                root.GetPrim().GetPath(),
+                times,
+                joint_extents,
+                extents_padding,
+            )
+
+    # `update_rig_animation` needs to know how the animation and its
+    # extents were written, to update them the same way
+    #
+    settings = dict(animation.GetPrim().GetCustomDataByKey(_WINDOWS_KEY) or {})
+    settings["compressed"] = compression_tolerance is not None
+    settings["extents_source"] = extents_source
+
+    if extents_padding is not None:
+        settings["extents_padding"] = float(extents_padding)
+
+    animation.GetPrim().SetCustomDataByKey(_WINDOWS_KEY, settings)
+
+    with profiler.phase("saving"):
+        animation_stage.Save()
+        skeleton_stage.GetRootLayer().Save()
+
+        for stage_ in (skeleton_stage, animation_stage):
+            main_stage.GetRootLayer().subLayerPaths.append(
+                os.path.relpath(stage_.GetRootLayer().identifier, folder)
+            )
+
+        main_stage.Save()
+
+
+def update_rig_animation(
+    node, root_path, animation_path, folder, window_size=None, check_curves=False
+):
+    """Re-export only the frames of a rig's animation that have changed.
+
+    The animation that :func:`write_rig_as_usdskel` exports is split into
+    windows of frames. For each window, a hash of the Maya animation
+    curves that drive the skeleton is compared to the hash that was
+    stored when the window was last written. If the curves are the same,
+    the window isn't sampled at all. Otherwise, the window's joint
+    matrices are sampled and compared with the stored matrices hash.
+    Only windows whose matrices changed get their time samples
+    rewritten. If the UsdSkelRoot has extents hints, those windows'
+    hints are written again, the same way that the export wrote them
+    (from the Maya meshes or from the joint animation).
+
+    Windows are only compared if the rig was exported with
+    `store_windows=True`. Otherwise, every window is rewritten once and
+    its hashes are stored for the next update.
+
+    Important:
+        Only animation that was exported with NumPy available, without
+        value clips and without compression can be updated. Compression
+        replaces time samples with default values and removes samples
+        that neighboring samples interpolate so rewriting one window
+        would change the animation outside of the window.
+
+    Args:
+        node (str):
+            The path to a joint on the Maya skeleton which was exported.
+        root_path (str):
+            The absolute USD namespace path to the UsdSkelRoot. e.g. "/SkeletonRoot".
+        animation_path (str):
+            The absolute USD namespace path to the exported Skeleton
+            animation. e.g. "/SkeletonAnimation".
+        folder (str):
+            The directory on-disk where the USD layers were written.
+        window_size (int, optional):
+            The number of frames in each window. If no size is given,
+            the size used by the previous export is used. If a different
+            size is given, every window is sampled again.
+        check_curves (bool, optional):
+            If True, windows whose upstream animation curves have not
+            changed are skipped without being sampled. This is only
+            safe if animation curves completely describe the rig's
+            motion. If any joint has no animation curve upstream, every
+            window is sampled anyway. It's False by default because
+            expressions, simulations and other time-dependent nodes can
+            change a window without changing any curve. When False,
+            every window is sampled and only its joint matrices are
+            compared with the stored hash, so a stale hash can't make
+            a changed window be skipped. Default is False.
 
-    meshes = set(mesh for joint in nodes for mesh in mesher.get_connected_meshes(joint))
-    data = _setup_meshes(
-        meshes, skeleton.GetPrim(), os.path.join(folder, "meshes.usda")
+    Raises:
+        EnvironmentError: If NumPy cannot be imported.
+        NotImplementedError:
+            If the animation was written as value clips or was compressed.
+        ValueError:
+            If there's no animation at `animation_path` or its joints
+            don't match the joints of `node`'s skeleton.
+
+    Returns:
+        dict[str, list[float or int]]:
+            The first frame of every window which was "skipped" (its
+            curves didn't change), "unchanged" (it was sampled but
+            matched) or "rewritten".
+
+    """
+    if numpy is None:
+        raise EnvironmentError("NumPy is required to update animation.")
+
+    animation_stage = Usd.Stage.Open(os.path.join(folder, "animation.usda"))
+    animation = UsdSkel.Animation.Get(animation_stage, animation_path)
+
+    if not animation:
+        raise ValueError(
+            'Path "{animation_path}" is not a UsdSkel Animation.'.format(
+                animation_path=animation_path
+            )
+        )
+
+    prim = animation.GetPrim()
+
+    if Usd.ClipsAPI(prim).GetClipAssetPaths():
+        raise NotImplementedError("Animation written as value clips cannot be updated.")
+
+    stored = prim.GetCustomDataByKey(_WINDOWS_KEY) or {}
+
+    if stored.get("compressed"):
+        raise NotImplementedError(
+            "Compressed animation cannot be updated. Export the rig again, instead."
+        )
+
+    joints, nodes = helper.get_all_joints(node)
+
+    if list(animation.GetJointsAttr().Get() or []) != joints:
+        raise ValueError(
+            'Animation "{animation_path}" joints don\'t match the joints of "{node}".'.format(
+                animation_path=animation_path, node=node
+            )
+        )
+
+    topology = _validate_topology(joints)
+    main_stage = Usd.Stage.Open(os.path.join(folder, "main.usda"))
+    times = list(
+        common.frange(main_stage.GetStartTimeCode(), main_stage.GetEndTimeCode())
     )
-    _setup_cached_extents_hints(main_stage, root.GetPrim().GetPath(), meshes, times)
-    skinner.setup_skinning(data, nodes)
 
-    skeleton_stage.GetRootLayer().Save()
+    window_size = window_size or stored.get("window_size") or len(times)
+    previous_windows = {}
+
+    if stored.get("window_size") == window_size:
+        previous_windows = stored.get("windows") or {}
+
+    root = main_stage.GetPrimAtPath(root_path)
+    extents = False
+
+    if root.IsValid():
+        extents = bool(UsdGeom.ModelAPI(root).GetExtentsHintAttr().GetNumTimeSamples())
+
+    extents_source = stored.get("extents_source", "maya")
+    extents_padding = stored.get("extents_padding")
+    meshes = []
+
+    if extents and extents_source == "animation" and extents_padding is None:
+        # Rigs exported before the padding was stored get it the way the export did
+        extents_padding = _get_skinning_padding(
+            [
+                UsdSkel.BindingAPI(prim)
+                for prim in Usd.PrimRange(root)
+                if prim.IsA(UsdGeom.Mesh)
+            ],
+            UsdSkel.Skeleton.Get(main_stage, root_path + "/Skeleton")
+            .GetBindTransformsAttr()
+            .Get(),
+        )
 
-    for stage_ in (skeleton_stage, animation_stage):
-        main_stage.GetRootLayer().subLayerPaths.append(
-            os.path.relpath(stage_.GetRootLayer().identifier, folder)
+    if extents and extents_source == "maya":
+        meshes = set(
+            mesh for joint in nodes for mesh in mesher.get_connected_meshes(joint)
         )
 
-    main_stage.Save()
+    if check_curves:
+        undriven = animator.get_undriven_nodes(nodes)
+
+        if undriven:
+            LOGGER.warning(
+                'Joints "%s" have no animation curves. Every window will be sampled.',
+                undriven,
+            )
+            check_curves = False
+
+    curves = animator.get_animation_curves(nodes) if check_curves else []
+    attributes = [
+        animation.GetTranslationsAttr(),
+        animation.GetRotationsAttr(),
+        animation.GetScalesAttr(),
+    ]
+    windows = {}
+    report = {"skipped": [], "unchanged": [], "rewritten": []}
+
+    for chunk in common.iter_chunks(times, window_size):
+        key = _get_window_key(chunk[0])
+        previous = previous_windows.get(key) or {}
+        curves_hash = ""
+
+        if check_curves:
+            curves_hash = animator.get_curves_hash(curves, chunk[0], chunk[-1])
+
+            if previous.get("matrices") and previous.get("curves") == curves_hash:
+                windows[key] = previous
+                report["skipped"].append(chunk[0])
+
+                continue
+
+        world_matrices = animator.get_node_matrices_at_times(nodes, chunk, "world")
+        matrices_hash = _get_matrices_hash(world_matrices)
+        windows[key] = {"curves": curves_hash, "matrices": matrices_hash}
+
+        if previous.get("matrices") == matrices_hash:
+            report["unchanged"].append(chunk[0])
+
+            continue
+
+        _erase_time_samples(attributes, chunk[0], chunk[-1])
+        _setup_animation_in_bulk(animation, chunk, joints, world_matrices, topology)
+
+        if extents and extents_source == "animation":
+            _setup_extents_hints_from_animation(
+                main_stage,
+                root_path,
+                chunk,
+                animator.get_position_extents(world_matrices),
+                extents_padding,
+            )
+        elif extents:
+            _write_extents_hints(
+                main_stage,
+                root_path,
+                chunk,
+                mesher.get_overall_bounding_boxes(meshes, chunk),
+            )
+
+        report["rewritten"].append(chunk[0])
+
+    stored = dict(stored)
+    stored.update({"window_size": window_size, "windows": windows})
+
+    if extents_padding is not None:
+        stored["extents_padding"] = float(extents_padding)
+    prim.SetCustomDataByKey(_WINDOWS_KEY, stored)
+    animation_stage.Save()
+
+    if extents and report["rewritten"]:
+        main_stage.Save()
+
+    return report
@@ -4,6 +4,9 @@
 """A set of generic Maya/USD helper functions."""
 
 from maya import cmds
+from maya.api import OpenMaya, OpenMayaAnim
+
+from . import profiler
 
 
 class UndoChunk(object):
@@ -114,6 +117,42 @@ def convert_maya_path_to_usd(path):
     return path
 
 
+def iter_times(times):
+    """Change Maya's current time to each given time.
+
+    The scene's original time is restored once every time has been
+    iterated over.
+
+    Args:
+        times (iter[float or int]): The times to visit, in the scene's current time unit.
+
+    Yields:
+        tuple[int, float or int]: The index of each time and the time itself.
+
+    """
+    unit = OpenMaya.MTime.uiUnit()
+    original = OpenMayaAnim.MAnimControl.currentTime()
+
+    try:
+        for index, time_code in enumerate(times):
+            OpenMayaAnim.MAnimControl.setCurrentTime(OpenMaya.MTime(time_code, unit))
+            profiler.count("api.MAnimControl.setCurrentTime")
+
+            yield (index, time_code)
+    finally:
+        OpenMayaAnim.MAnimControl.setCurrentTime(original)
+
+
+def get_dag_paths(nodes):
+    """list[`maya.api.OpenMaya.MDagPath`]: Get an API object for every Maya DAG node."""
+    selection = OpenMaya.MSelectionList()
+
+    for node in nodes:
+        selection.add(node)
+
+    return [selection.getDagPath(index) for index in range(selection.length())]
+
+
 def get_all_joints(joint):
     """Get the full joint hierarchy that `joint` is a part of.
 
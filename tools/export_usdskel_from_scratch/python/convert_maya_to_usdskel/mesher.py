@@ -5,10 +5,16 @@
 
 # IMPORT THIRD-PARTY LIBRARIES
 from maya import cmds
+from maya.api import OpenMaya
 from pxr import UsdGeom
 
 # IMPORT LOCAL LIBRARIES
-from . import helper
+from . import helper, profiler
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
 
 
 def get_overall_bounding_box(meshes, time_code):
@@ -27,37 +33,72 @@ def get_overall_bounding_box(meshes, time_code):
 
     """
     if not meshes:
-        return ValueError('Meshes "{meshes}" cannot be empty.'.format(meshes=meshes))
+        raise ValueError('Meshes "{meshes}" cannot be empty.'.format(meshes=meshes))
 
-    minimum_x_values = set()
-    minimum_y_values = set()
-    minimum_z_values = set()
-    maximum_x_values = set()
-    maximum_y_values = set()
-    maximum_z_values = set()
+    minimum_x_values = []
+    minimum_y_values = []
+    minimum_z_values = []
+    maximum_x_values = []
+    maximum_y_values = []
+    maximum_z_values = []
 
     for mesh in meshes:
-        minimum_x_values.add(cmds.getAttr(mesh + ".boundingBoxMinX", time=time_code))
-        minimum_y_values.add(cmds.getAttr(mesh + ".boundingBoxMinY", time=time_code))
-        minimum_z_values.add(cmds.getAttr(mesh + ".boundingBoxMinZ", time=time_code))
-
-        maximum_x_values.add(cmds.getAttr(mesh + ".boundingBoxMaxX", time=time_code))
-        maximum_y_values.add(cmds.getAttr(mesh + ".boundingBoxMaxY", time=time_code))
-        maximum_z_values.add(cmds.getAttr(mesh + ".boundingBoxMaxZ", time=time_code))
+        minimum_x_values.append(cmds.getAttr(mesh + ".boundingBoxMinX", time=time_code))
+        minimum_y_values.append(cmds.getAttr(mesh + ".boundingBoxMinY", time=time_code))
+        minimum_z_values.append(cmds.getAttr(mesh + ".boundingBoxMinZ", time=time_code))
 
-    minimum_x = sorted(minimum_x_values)[0]
-    minimum_y = sorted(minimum_y_values)[0]
-    minimum_z = sorted(minimum_z_values)[0]
-    maximum_x = sorted(maximum_x_values)[0]
-    maximum_y = sorted(maximum_y_values)[0]
-    maximum_z = sorted(maximum_z_values)[0]
+        maximum_x_values.append(cmds.getAttr(mesh + ".boundingBoxMaxX", time=time_code))
+        maximum_y_values.append(cmds.getAttr(mesh + ".boundingBoxMaxY", time=time_code))
+        maximum_z_values.append(cmds.getAttr(mesh + ".boundingBoxMaxZ", time=time_code))
 
     return (
-        (minimum_x, minimum_y, minimum_z),
-        (maximum_x, maximum_y, maximum_z),
+        (min(minimum_x_values), min(minimum_y_values), min(minimum_z_values)),
+        (max(maximum_x_values), max(maximum_y_values), max(maximum_z_values)),
     )
 
 
+def get_overall_bounding_boxes(meshes, times):
+    """Find a bounding box that surrounds every given Maya mesh, for every time.
+
+    The scene time is only changed once per-time and every mesh's
+    bounding box is read directly from the Maya API, instead of calling
+    `cmds.getAttr` six times per mesh, per time.
+
+    Args:
+        meshes (iter[str]): The paths to Maya meshes that each have bounding box data.
+        times (iter[float or int]): The times to get bounding box data for.
+
+    Raises:
+        EnvironmentError: If NumPy cannot be imported.
+        ValueError: If `meshes` is empty.
+
+    Returns:
+        `numpy.ndarray`:
+            The minimum and maximum 3D points that surround every mesh,
+            for each time. It's shaped (times, 2, 3).
+
+    """
+    if numpy is None:
+        raise EnvironmentError("NumPy is required to sample bounding boxes in bulk.")
+
+    paths = helper.get_dag_paths(meshes)
+
+    if not paths:
+        raise ValueError('Meshes "{meshes}" cannot be empty.'.format(meshes=meshes))
+
+    times = list(times)
+    boxes = numpy.empty((len(times), len(paths), 2, 3), dtype=numpy.float64)
+    profiler.count("api.MFnDagNode.boundingBox", len(times) * len(paths))
+
+    for index, _ in helper.iter_times(times):
+        for mesh_index, path in enumerate(paths):
+            box = OpenMaya.MFnDagNode(path).boundingBox
+            boxes[index, mesh_index, 0] = tuple(box.min)[:3]
+            boxes[index, mesh_index, 1] = tuple(box.max)[:3]
+
+    return numpy.stack((boxes[:, :, 0].min(axis=1), boxes[:, :, 1].max(axis=1)), axis=1)
+
+
 def get_connected_meshes(joint):
     """Find every mesh that is skinned for some joint.
 
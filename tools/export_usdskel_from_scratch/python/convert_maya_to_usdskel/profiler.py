@@ -0,0 +1,263 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""Time each phase of an export and count the Maya calls that each phase makes.
+
+While a :class:`Profiler` is active, every `maya.cmds` command that this
+package calls is counted, as well as every bulk Maya API query. Each
+count is added to the phase which was running at the time.
+
+Example:
+    >>> from convert_maya_to_usdskel import converter, profiler
+    >>> with profiler.Profiler() as profile:
+    ...     converter.write_rig_as_usdskel(
+    ...         "root_joint", "/SkeletonRoot", "/SkeletonAnimation", "/tmp/test_export"
+    ...     )
+    >>> profile.save("/tmp/test_export/profile.json", trace_path="/tmp/test_export/trace.json")
+
+The trace file can be opened in Chrome, using "chrome://tracing".
+
+"""
+
+# IMPORT STANDARD LIBRARIES
+import collections
+import contextlib
+import functools
+import json
+import os
+import sys
+import threading
+import timeit
+
+_ACTIVE = []
+_TIMER = timeit.default_timer
+
+
+class _CommandsProxy(object):
+    """A stand-in for `maya.cmds` which counts every command that is called."""
+
+    def __init__(self, commands, profiler):
+        """Keep track of the real commands module and the profiler to count with.
+
+        Args:
+            commands (module): The real `maya.cmds` module.
+            profiler (`Profiler`): The object which counts each command.
+
+        """
+        super(_CommandsProxy, self).__init__()
+
+        self._commands = commands
+        self._profiler = profiler
+
+    def __getattr__(self, name):
+        """Get a command that counts itself whenever it is called."""
+        value = getattr(self._commands, name)
+
+        if not callable(value):
+            return value
+
+        @functools.wraps(value)
+        def _count(*args, **kwargs):
+            self._profiler.count("cmds." + name)
+
+            return value(*args, **kwargs)
+
+        return _count
+
+
+class Profiler(object):
+    """Record how long each export phase takes and how many Maya calls it makes.
+
+    Attributes:
+        events (list[tuple[str, float, float, int]]):
+            The name, start, duration (in seconds) and thread of every
+            phase that was run.
+        counters (dict[str, `collections.Counter`]):
+            The number of Maya calls made during each phase, by call name.
+
+    """
+
+    def __init__(self):
+        """Create an empty profiler. Use it as a context to start profiling."""
+        super(Profiler, self).__init__()
+
+        self.events = []
+        self.counters = collections.defaultdict(collections.Counter)
+
+        self._patched = []
+        self._stack = []
+        self._start = None
+        self._end = None
+
+    def __enter__(self):
+        """Start profiling and count every `maya.cmds` call from this package."""
+        if _ACTIVE:
+            raise RuntimeError("Only one profiler can be active at a time.")
+
+        _ACTIVE.append(self)
+        self._patch()
+        self._start = _TIMER()
+        self._end = None
+
+        return self
+
+    def __exit__(self, exec_type, exec_value, traceback):
+        """Stop profiling and restore the original `maya.cmds`."""
+        self._end = _TIMER()
+        self._restore()
+        _ACTIVE.remove(self)
+
+    def _patch(self):
+        """Replace `maya.cmds` in every module of this package with a counting proxy."""
+        package = __name__.rpartition(".")[0]
+
+        for name, module in list(sys.modules.items()):
+            if not name.startswith(package + ".") or module is None:
+                continue
+
+            commands = getattr(module, "cmds", None)
+
+            if getattr(commands, "__name__", "") != "maya.cmds":
+                continue
+
+            self._patched.append((module, commands))
+            module.cmds = _CommandsProxy(commands, self)
+
+    def _restore(self):
+        """Put back every `maya.cmds` that was replaced by :meth:`_patch`."""
+        for module, commands in self._patched:
+            module.cmds = commands
+
+        self._patched = []
+
+    def count(self, name, amount=1):
+        """Add to some counter of the current phase.
+
+        Args:
+            name (str): The counter to add to. e.g. "cmds.getAttr".
+            amount (int, optional): The number to add. Default: 1.
+
+        """
+        phase_name = self._stack[-1] if self._stack else ""
+        self.counters[phase_name][name] += amount
+
+    @contextlib.contextmanager
+    def phase(self, name):
+        """Time everything that runs inside of this context as one phase.
+
+        Phases may be nested. Counts are always added to the innermost phase.
+
+        Args:
+            name (str): The name of the phase. e.g. "skinning".
+
+        """
+        self._stack.append(name)
+        start = _TIMER()
+
+        try:
+            yield
+        finally:
+            self.events.append(
+                (name, start, _TIMER() - start, threading.current_thread().ident)
+            )
+            self._stack.pop()
+
+    def get_report(self):
+        """Summarize every phase.
+
+        Returns:
+            dict[str, object]:
+                The total seconds and, for every phase, its total
+                seconds, the number of times that it ran and its counters.
+
+        """
+        phases = collections.OrderedDict()
+
+        for name, _, duration, _ in sorted(self.events, key=lambda event: event[1]):
+            phase = phases.setdefault(
+                name, {"seconds": 0.0, "calls": 0, "counters": {}}
+            )
+            phase["seconds"] += duration
+            phase["calls"] += 1
+
+        for name, counter in self.counters.items():
+            phase = phases.setdefault(
+                name or "(no phase)", {"seconds": 0.0, "calls": 0, "counters": {}}
+            )
+            phase["counters"] = dict(counter)
+
+        end = self._end if self._end is not None else _TIMER()
+
+        return {
+            "seconds": end - self._start if self._start is not None else 0.0,
+            "phases": phases,
+        }
+
+    def get_trace_events(self):
+        """Convert every phase into Chrome trace events.
+
+        Returns:
+            list[dict[str, object]]: Every phase as a "complete" event, in microseconds.
+
+        """
+        process = os.getpid()
+        start = self._start or 0.0
+
+        return [
+            {
+                "name": name,
+                "cat": "convert_maya_to_usdskel",
+                "ph": "X",
+                "ts": (event_start - start) * 1e6,
+                "dur": duration * 1e6,
+                "pid": process,
+                "tid": thread,
+            }
+            for name, event_start, duration, thread in self.events
+        ]
+
+    def save(self, path, trace_path=None):
+        """Write the report of this profiler to-disk.
+
+        Args:
+            path (str): The JSON file to write the report to.
+            trace_path (str, optional): If given, write Chrome trace events to this file.
+
+        """
+        with open(path, "w") as handler:
+            json.dump(self.get_report(), handler, indent=4)
+
+        if not trace_path:
+            return
+
+        with open(trace_path, "w") as handler:
+            json.dump({"traceEvents": self.get_trace_events()}, handler)
+
+
+def count(name, amount=1):
+    """Add to some counter of the active profiler, if there is one.
+
+    Args:
+        name (str): The counter to add to. e.g. "api.MFnDagNode.boundingBox".
+        amount (int, optional): The number to add. Default: 1.
+
+    """
+    if _ACTIVE:
+        _ACTIVE[-1].count(name, amount=amount)
+
+
+@contextlib.contextmanager
+def phase(name):
+    """Time some phase with the active profiler. If no profiler is active, do nothing.
+
+    Args:
+        name (str): The name of the phase. e.g. "skinning".
+
+    """
+    if not _ACTIVE:
+        yield
+
+        return
+
+    with _ACTIVE[-1].phase(name):
+        yield
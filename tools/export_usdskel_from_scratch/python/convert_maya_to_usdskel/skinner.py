@@ -8,8 +8,17 @@ import functools
 
 # IMPORT THIRD-PARTY LIBRARIES
 from maya import cmds
+from maya.api import OpenMaya, OpenMayaAnim
 from pxr import Gf, UsdSkel, Vt
 
+# IMPORT LOCAL LIBRARIES
+from . import profiler
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
 
 def _get_skin_cluster(meshes):
     clusters = set()
@@ -50,6 +59,7 @@ def _get_weighted_joints(vertex, cluster, influences):
 def _calculate_influences(
     mesh, cluster, binding_joints, maximum_influences, weights_getter
 ):
+    joint_indices = {joint: index for index, joint in enumerate(binding_joints)}
     indices = []
     weights = []
 
@@ -67,7 +77,7 @@ def _calculate_influences(
             )
 
         for joint in vertex_influence_joints:
-            indices.append(binding_joints.index(joint))
+            indices.append(joint_indices[joint])
 
             weights.append(
                 cmds.skinPercent(
@@ -78,22 +88,110 @@ def _calculate_influences(
     return indices, weights
 
 
+def _calculate_influences_in_bulk(mesh, cluster, binding_joints, maximum_influences):
+    """Get the joint indices and weights of every vertex of a mesh in one query.
+
+    Every weight of `mesh` is read from `cluster` with a single
+    `MFnSkinCluster.getWeights` call instead of querying each vertex and
+    joint with `cmds.skinPercent`.
+
+    Args:
+        mesh (str): The path to a Maya mesh shape which `cluster` deforms.
+        cluster (str): The skin cluster that deforms `mesh`.
+        binding_joints (list[str]):
+            The absolute paths to Maya joints, in USD topology-order.
+        maximum_influences (int): The number of joints that must affect each vertex.
+
+    Raises:
+        EnvironmentError: If NumPy cannot be imported.
+        RuntimeError:
+            If a vertex doesn't have exactly `maximum_influences` weighted
+            joints or if a weighted joint isn't in `binding_joints`.
+
+    Returns:
+        tuple[`numpy.ndarray`, `numpy.ndarray`]:
+            The index (in `binding_joints`) and normalized weight of every
+            weighted joint of every vertex, ordered by vertex.
+
+    """
+    if numpy is None:
+        raise EnvironmentError("NumPy is required to read skin weights in bulk.")
+
+    selection = OpenMaya.MSelectionList()
+    selection.add(cluster)
+    selection.add(mesh)
+    skin = OpenMayaAnim.MFnSkinCluster(selection.getDependNode(0))
+    shape = selection.getDagPath(1)
+
+    components = OpenMaya.MFnSingleIndexedComponent()
+    vertices = components.create(OpenMaya.MFn.kMeshVertComponent)
+    components.setCompleteData(OpenMaya.MFnMesh(shape).numVertices)
+
+    weights, influence_count = skin.getWeights(shape, vertices)
+    profiler.count("api.MFnSkinCluster.getWeights")
+    # `maya.api` arrays don't support the buffer protocol so they can't be
+    # copied directly. `numpy.fromiter` at least fills a pre-sized array
+    # in one pass instead of inspecting `weights` as a nested sequence first
+    #
+    weights = numpy.fromiter(weights, dtype=numpy.float64, count=len(weights))
+    weights = weights.reshape(-1, influence_count)
+
+    joint_indices = {joint: index for index, joint in enumerate(binding_joints)}
+    influence_indices = numpy.array(
+        [
+            joint_indices.get(path.fullPathName(), -1)
+            for path in skin.influenceObjects()
+        ],
+        dtype=numpy.int32,
+    )
+
+    weighted = weights != 0
+    counts = numpy.count_nonzero(weighted, axis=1)
+    invalid = numpy.flatnonzero(counts != maximum_influences)
+
+    if invalid.size:
+        raise RuntimeError(
+            'Vertex "{vertex}" has "{influences}". It needs to have "{maximum_influences}" influences.'.format(
+                vertex="{mesh}.vtx[{index}]".format(mesh=mesh, index=invalid[0]),
+                influences=counts[invalid[0]],
+                maximum_influences=maximum_influences,
+            )
+        )
+
+    vertices, influences = numpy.nonzero(weighted)
+    indices = influence_indices[influences]
+
+    if (indices < 0).any():
+        raise RuntimeError(
+            'Cluster "{cluster}" has weighted joints which aren\'t in "{binding_joints}".'.format(
+                cluster=cluster, binding_joints=binding_joints
+            )
+        )
+
+    weights = weights / weights.sum(axis=1, keepdims=True)
+
+    return (indices, weights[vertices, influences].astype(numpy.float32))
+
+
+def _to_vt_array(type_, values):
+    """Convert a NumPy array into some Vt array type, e.g. `pxr.Vt.IntArray`."""
+    try:
+        return type_.FromNumpy(values)
+    except AttributeError:
+        # Older USD versions can't convert directly from NumPy
+        return type_(values.tolist())
+
+
 def _write_influence_data(
-    binding, mesh, cluster, binding_joints, maximum_influences, weights_getter
+    binding, mesh, indices, weights, joint_count, maximum_influences
 ):
     matrix = cmds.xform(mesh, matrix=True, worldSpace=True, q=True)
     binding.CreateGeomBindTransformAttr().Set(Gf.Matrix4d(*matrix))
 
-    indices, weights = _calculate_influences(
-        mesh, cluster, binding_joints, maximum_influences, weights_getter
-    )
-    indices = Vt.IntArray(indices)
-    weights = Vt.FloatArray(weights)
-
     # Reference: https://graphics.pixar.com/usd/docs/api/_usd_skel__schemas.html#UsdSkel_BindingAPI_StoringInfluences
     # Keep weights sorted and normalized for best performance
     #
-    UsdSkel.NormalizeWeights(weights, len(binding_joints))
+    UsdSkel.NormalizeWeights(weights, joint_count)
     UsdSkel.SortInfluences(indices, weights, maximum_influences)
 
     indices_attribute = binding.CreateJointIndicesPrimvar(
@@ -135,22 +233,34 @@ def setup_skinning(data, joints):
             'No skin cluster could be found from data "{data}".'.format(data=data)
         )
 
-    all_influence_joints = cmds.skinCluster(cluster, query=True, weightedInfluence=True)
-    all_influence_joints = [
-        cmds.ls(joint, long=True)[0] for joint in all_influence_joints
-    ]
-    _get_weighted_joints_cached = functools.partial(
-        _get_weighted_joints, influences=all_influence_joints
-    )
-
     maximum_influences = min(cmds.getAttr(cluster + ".maxInfluences"), len(joints))
 
+    if numpy is None:
+        # Only the per-vertex fallback needs the full path of every influence
+        all_influence_joints = cmds.skinCluster(
+            cluster, query=True, weightedInfluence=True
+        )
+        all_influence_joints = [
+            cmds.ls(joint, long=True)[0] for joint in all_influence_joints
+        ]
+        _get_weighted_joints_cached = functools.partial(
+            _get_weighted_joints, influences=all_influence_joints
+        )
+
     for mesh, binding in data:
+        if numpy is not None:
+            indices, weights = _calculate_influences_in_bulk(
+                mesh, cluster, joints, maximum_influences
+            )
+            indices = _to_vt_array(Vt.IntArray, indices)
+            weights = _to_vt_array(Vt.FloatArray, weights)
+        else:
+            indices, weights = _calculate_influences(
+                mesh, cluster, joints, maximum_influences, _get_weighted_joints_cached
+            )
+            indices = Vt.IntArray(indices)
+            weights = Vt.FloatArray(weights)
+
         _write_influence_data(
-            binding,
-            mesh,
-            cluster,
-            joints,
-            maximum_influences,
-            _get_weighted_joints_cached,
+            binding, mesh, indices, weights, len(joints), maximum_influences
         )
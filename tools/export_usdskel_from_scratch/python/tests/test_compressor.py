@@ -0,0 +1,66 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""Make sure that compressing UsdSkel animation never changes how it looks."""
+
+# IMPORT STANDARD LIBRARIES
+import math
+import unittest
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+try:
+    from convert_maya_to_usdskel import compressor
+except ImportError:  # USD isn't installed
+    compressor = None
+
+
+def _get_quaternion(angle):
+    """tuple[float]: Get a (real, i, j, k) rotation of `angle` radians around X."""
+    return (math.cos(angle / 2.0), math.sin(angle / 2.0), 0.0, 0.0)
+
+
+@unittest.skipIf(
+    numpy is None or compressor is None, "NumPy and USD are required to compress."
+)
+class RedundantTimes(unittest.TestCase):
+    """Find the time samples that interpolation reproduces."""
+
+    def test_linear(self):
+        """Remove the in-between samples of a straight line."""
+        data = numpy.array([[[0.0, 0.0, 0.0]], [[1.0, 0.0, 0.0]], [[2.0, 0.0, 0.0]]])
+
+        self.assertEqual(
+            {1}, compressor._get_redundant_times([0, 1, 2], data, 1e-5, False)
+        )
+
+    def test_negated_rotation(self):
+        """Remove a sample which is the negation of its interpolated rotation."""
+        data = numpy.array(
+            [
+                [_get_quaternion(0.0)],
+                [[-value for value in _get_quaternion(0.5)]],
+                [_get_quaternion(1.0)],
+            ]
+        )
+
+        self.assertEqual(
+            {1}, compressor._get_redundant_times([0, 1, 2], data, 1e-5, True)
+        )
+
+    def test_flipped_rotation(self):
+        """Keep a rotation that flips between +angle and -angle."""
+        data = numpy.array(
+            [
+                [_get_quaternion(0.5)],
+                [_get_quaternion(-0.5)],
+                [_get_quaternion(0.5)],
+            ]
+        )
+
+        self.assertEqual(
+            set(), compressor._get_redundant_times([0, 1, 2], data, 1e-5, True)
+        )
@@ -0,0 +1,101 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""Make sure that searching memory-mapped Assets matches searching them as text."""
+
+# IMPORT STANDARD LIBRARIES
+import io
+import os
+import shutil
+import tempfile
+import unittest
+
+try:
+    import usd_searcher
+except ImportError:  # USD isn't installed
+    usd_searcher = None
+
+
+def _search_as_text(path, phrases, regex):
+    """list[`usd_searcher.Match`]: Search a file line-by-line, as universal-newline text."""
+    matcher = usd_searcher._get_matcher(phrases, regex)
+    matches = []
+
+    with io.open(path, "r", encoding="utf-8", errors="replace") as handler:
+        for row, line in enumerate(handler):
+            for phrase in matcher(line):
+                matches.append(usd_searcher.Match(path, row, line, phrase))
+
+    return matches
+
+
+@unittest.skipIf(usd_searcher is None, "USD is required to search.")
+class AssetModes(unittest.TestCase):
+    """Compare memory-mapped, bytes searches against line-by-line, text searches."""
+
+    def setUp(self):
+        """Create a temporary folder for Asset files."""
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        """Delete every temporary Asset file."""
+        shutil.rmtree(self.directory)
+
+    def _compare(self, data, phrases, regex=False):
+        """Search `data` both ways and make sure the results are the same."""
+        path = os.path.join(self.directory, "asset.txt")
+
+        with open(path, "wb") as handler:
+            handler.write(data)
+
+        expected = _search_as_text(path, phrases, regex)
+        found = list(usd_searcher._iter_asset_matches([path], phrases, regex))
+
+        self.assertEqual(expected, found)
+
+        return found
+
+    def test_literal(self):
+        """Find plain text on several lines."""
+        found = self._compare(b"foo\nbar\nfoo bar\n", ("bar",))
+
+        self.assertEqual([1, 2], [match.row for match in found])
+
+    def test_several_phrases(self):
+        """Find several phrases in one pass."""
+        self._compare(b"foo\nbar\nfizz\n", ("foo", "fizz"))
+        self._compare(b"foo\nbar\nfizz\n", ("f.o", "^b", r"(z)\1"), regex=True)
+
+    def test_unicode_dot(self):
+        """Match "." against a non-ASCII character."""
+        found = self._compare(u"café\nthe cafe\n".encode("utf-8"), ("caf.$",), True)
+
+        self.assertEqual(2, len(found))
+
+    def test_unicode_ignore_case(self):
+        """Ignore the case of non-ASCII characters."""
+        found = self._compare(u"the CAFÉ\n".encode("utf-8"), (u"(?i)café",), True)
+
+        self.assertEqual(1, len(found))
+
+    def test_word_characters(self):
+        r"""Match "\w" against a non-ASCII character."""
+        found = self._compare(u"naïve and\n".encode("utf-8"), (r"^\w+ and$",), True)
+
+        self.assertEqual(1, len(found))
+
+    def test_start_of_line(self):
+        r"""Match "\A" at the start of every line, not just the file."""
+        found = self._compare(b"foo\nfoo\n", (r"\Afoo",), True)
+
+        self.assertEqual(2, len(found))
+
+    def test_windows_line_endings(self):
+        """Normalize "\\r\\n" lines before they're matched."""
+        found = self._compare(b"foo\r\nbar\r\n", ("foo$", "bar\n"), True)
+
+        self.assertEqual([u"foo\n", u"bar\n"], [match.text for match in found])
+
+    def test_no_trailing_newline(self):
+        """Find a match on the last line of a file, which has no newline."""
+        self._compare(b"foo\nbar", ("bar",))
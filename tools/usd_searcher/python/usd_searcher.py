@@ -5,10 +5,21 @@
 
 Attributes:
     Match (`collections.namedtuple`):
-        A container that represents a matched file / line. It has 3 members:
+        A container that represents a matched file / line. It has 4 members:
         "path" (str): The absolute path on-disk where a match was found.
-        "row" (int): The 0-based line number where the match was found.
+        "row" (int or str):
+            The 0-based line number where the match was found. If the
+            match was found with a structured search, this is the path
+            of the Sdf spec where the match was found, instead.
         "text" (str): The line that matched a search phrase.
+        "pattern" (str): The search phrase that matched.
+    Options (`collections.namedtuple`):
+        The checked settings of a search. See :func:`get_options`. It has 5 members:
+        "phrases" (tuple[str]): The text to search for.
+        "regex" (bool): If `phrases` are regular expressions.
+        "ignore_binary" (bool): If USD crate files are skipped.
+        "structured" (bool): If USD Layers are searched as specs instead of as text.
+        "prefetch" (int): The number of USD Layers to load on background threads.
 
 """
 
@@ -19,9 +30,17 @@ from __future__ import division
 import collections
 import functools
 import mimetypes
+import mmap
+import multiprocessing
 import os
 import re
-import string
+import timeit
+from multiprocessing import pool as pool_
+
+try:
+    from re import _parser as sre_parse
+except ImportError:
+    import sre_parse
 
 # IMPORT THIRD-PARTY LIBRARIES
 from pxr import Sdf, UsdUtils
@@ -30,7 +49,63 @@ _EXTENSIONS = tuple(
     ("." + extension for extension in Sdf.FileFormat.FindAllFileFormatExtensions())
 )
 
-Match = collections.namedtuple("Match", "path row text")
+_TEXT_CHARACTERS = bytes(bytearray(range(32, 127)) + bytearray(b"\n\r\t\b"))
+_TEXT_SAMPLE_SIZE = 512
+_TIMER = timeit.default_timer
+
+# These fields are either searched separately or aren't text that is
+# worth searching
+#
+_IGNORED_INFO_KEYS = frozenset(
+    ("connectionPaths", "default", "targetPaths", "timeSamples")
+)
+_STRING_TYPES = (
+    Sdf.ValueTypeNames.Asset,
+    Sdf.ValueTypeNames.String,
+    Sdf.ValueTypeNames.Token,
+)
+
+# Numbered and named back-references refer to groups by position, which
+# changes when a pattern is combined with other patterns
+#
+_BACK_REFERENCE = re.compile(r"\\[1-9]|\(\?P=")
+_LINE_ENDINGS = re.compile(r"[\r\n]")
+
+Match = collections.namedtuple("Match", "path row text pattern")
+Match.__new__.__defaults__ = (None,)
+Options = collections.namedtuple(
+    "Options", "phrases regex ignore_binary structured prefetch"
+)
+
+
+class Results(set):
+    """The matches of a search and how long each stage of the search took.
+
+    Attributes:
+        timings (dict[str, float]):
+            The seconds spent in each stage of the search.
+            "dependencies": Finding every dependency of the searched USD file.
+            "index": Skipping files using a trigram index (if one was given).
+            "open": Opening each USD Layer and checking if it's binary.
+            "export": Exporting each USD Layer as text.
+            "match": Matching each USD Layer's text or specs.
+            "assets": Reading and matching every Asset file.
+            If several processes or threads are used, the time of every
+            process or thread is added together.
+
+    """
+
+    def __init__(self, matches=(), timings=None):
+        """Store the found matches and the time it took to find them.
+
+        Args:
+            matches (iter[`usd_searcher.Match`], optional): Every match that was found.
+            timings (dict[str, float], optional): The seconds spent in each stage.
+
+        """
+        super(Results, self).__init__(matches)
+
+        self.timings = timings or {}
 
 
 class UnresolvedFound(Exception):
@@ -49,68 +124,942 @@ class UnresolvedFound(Exception):
         self.paths = paths
 
 
-def _search_assets(assets, matcher):
-    """set[`usd_searcher.Match`]: Find every match for every given Asset."""
-    matches = set()
+def _add_time(timings, stage, seconds):
+    """Add `seconds` to the total time of some search stage, if `timings` is given."""
+    if timings is not None:
+        timings[stage] = timings.get(stage, 0.0) + seconds
 
-    for asset in assets:
-        with open(asset, "r") as handler:
-            for index, line in enumerate(handler.readlines()):
-                if matcher(line):
-                    matches.add(Match(asset, index, line))
 
-    return matches
+def _decode(line):
+    """str: Convert the bytes of some matched line back into text."""
+    if isinstance(line, str):
+        return line
 
+    return line.decode("utf-8", "replace")
 
-def _search_layers(layers, matcher):
-    """set[`usd_searcher.Match`]: Find every match for every given USD Layer."""
-    matches = set()
 
-    for layer in layers:
-        for index, line in enumerate(layer.ExportToString().splitlines()):
-            if matcher(line):
-                matches.add(Match(layer.realPath, index, line))
+def _default_matcher(phrase, line):
+    """bool: Check if `phrase` is a substring of `line`."""
+    return phrase in line
 
-    return matches
 
+def _encode(phrase):
+    """bytes: Convert some search phrase into bytes, so it can be matched in a file."""
+    if isinstance(phrase, bytes):
+        return phrase
 
-def istext(filename):
-    """Check if the given path is an ASCII-based text file.
+    return phrase.encode("utf-8")
+
+
+def _get_bytes_finder(phrases, regex):
+    """Create a function which finds lines of a memory-mapped file that may match.
+
+    Bytes and text regular expressions don't behave the same (e.g. "."
+    matches one byte, not one character, and IGNORECASE ignores
+    non-ASCII text). So the file is only searched for the literal text
+    that every match must contain and each found line is decoded and
+    checked with a text matcher, afterwards.
+
+    Args:
+        phrases (tuple[str]): The text to search for.
+        regex (bool): If True then `phrases` are treated as regular expressions.
+
+    Returns:
+        callable[`mmap.mmap`, int] -> int:
+            A function that finds the next possible match in a file,
+            starting at some offset (returning -1 if there's no match).
+            If any phrase has no required literal text, every line is
+            a possible match.
+
+    """
+    literals = []
+
+    for phrase in phrases:
+        # Line endings may be "\r\n" in the file so they can't be searched for as bytes
+        found = [
+            piece
+            for literal in (get_literals(phrase) if regex else [phrase])
+            for piece in _LINE_ENDINGS.split(literal)
+            if piece
+        ]
+
+        if not found:
+            return lambda data, start: start
+
+        literals.append(_encode(max(found, key=len)))
+
+    if len(literals) == 1:
+        literal = literals[0]
+
+        def _find(data, start):
+            return data.find(literal, start)
+
+        return _find
+
+    file_pattern = re.compile(
+        _join_alternatives([re.escape(literal) for literal in literals])
+    )
+
+    def _search(data, start):
+        match = file_pattern.search(data, start)
+
+        if match:
+            return match.start()
+
+        return -1
+
+    return _search
+
+
+def _get_chunks(items, count):
+    """list[list]: Split `items` into, at most, `count` groups of similar size."""
+    count = max(1, min(count, len(items)))
+
+    return [items[index::count] for index in range(count)]
+
+
+def _get_matcher(phrases, regex):
+    """Create a function which finds every phrase that is in a line.
+
+    If there's more than one phrase, they are combined into a single
+    regular expression so that each line is only searched once. Only
+    lines that match the combined expression are checked again, to find
+    out which of the phrases matched.
+
+    Args:
+        phrases (tuple[str]): The text to search for.
+        regex (bool): If True then `phrases` are treated as regular expressions.
+
+    Returns:
+        callable[str] -> list[str]:
+            A function that returns every one of `phrases` which matches
+            some line, in the same order as `phrases`. If nothing
+            matches, an empty list is returned.
+
+    """
+    checkers = []
+    alternatives = []
+
+    for phrase in phrases:
+        pattern = phrase
+
+        if regex:
+            checker = re.compile(pattern).search
+            combinable = not _BACK_REFERENCE.search(phrase)
+        else:
+            checker = functools.partial(_default_matcher, pattern)
+            combinable = True
+            pattern = re.escape(pattern)
+
+        checkers.append((phrase, checker, combinable))
+
+        if combinable:
+            alternatives.append(pattern)
+
+    combined = None
+
+    if len(alternatives) > 1:
+        try:
+            combined = re.compile(_join_alternatives(alternatives)).search
+        except re.error:
+            # e.g. Some patterns have global flags like "(?i)" which
+            # can't be combined. Check every phrase, one by one, instead.
+            #
+            pass
+
+    uncombined = [checker for checker in checkers if not checker[2]]
+
+    def _match(line):
+        if combined is not None and not combined(line):
+            found = uncombined
+        else:
+            found = checkers
+
+        return [phrase for phrase, checker, _ in found if checker(line)]
+
+    return _match
+
+
+def _get_phrases(phrase):
+    """tuple[str]: Convert a single phrase or several phrases into a tuple."""
+    if isinstance(phrase, (list, tuple, set, frozenset)):
+        return tuple(phrase)
+
+    return (phrase,)
+
+
+def _is_saved(layer):
+    """Check if some Layer would have the same contents if another process opens it.
+
+    Args:
+        layer (`pxr.Sdf.Layer` or str): A USD Layer or its identifier.
+
+    Returns:
+        bool: If `layer` isn't anonymous, has a file on-disk and has no unsaved changes.
+
+    """
+    if not isinstance(layer, Sdf.Layer):
+        layer = Sdf.Layer.Find(layer)
+
+        if not layer:
+            # Any process opens an unopened Layer from its file on-disk
+            return True
+
+    return not layer.anonymous and not layer.dirty and bool(get_layer_path(layer))
+
+
+def _is_text(data):
+    """Check if the start of some file looks like ASCII-based text.
 
     References:
         https://stackoverflow.com/a/1446870/3626104
 
     Args:
-        filename (str): The path to a file on-disk.
+        data (bytes): The first few bytes of some file.
 
     Returns:
-        bool: If the file is not binary.
+        bool: If `data` is not binary.
 
     """
-    s = open(filename).read(512)
-    text_characters = "".join(map(chr, range(32, 127)) + list("\n\r\t\b"))
-    _null_trans = string.maketrans("", "")
-
-    if not s:
+    if not data:
         # Empty files are considered text
         return True
 
-    if "\0" in s:
+    if b"\0" in data:
         # Files with null bytes are likely binary
         return False
-    # Get the non-text characters (maps a character to itself then
-    # use the 'remove' option to get rid of the text characters.)
-    t = s.translate(_null_trans, text_characters)
+
+    # Get the non-text characters by deleting every text character
+    non_text = data.translate(None, _TEXT_CHARACTERS)
 
     # If more than 30% non-text characters, then
     # this is considered a binary file
-    if float(len(t)) / float(len(s)) > 0.30:
+    if float(len(non_text)) / float(len(data)) > 0.30:
         return False
 
     return True
 
 
-def search(
+def _iter_asset_matches(assets, phrases, regex):
+    """Find every match for every given Asset.
+
+    Each Asset is memory-mapped and searched as bytes, all at once. Only
+    lines that may contain a match get decoded back into text and
+    matched so large files are never copied into memory.
+
+    Args:
+        assets (iter[str]): The absolute paths to Asset files to search within.
+        phrases (tuple[str]): The text to search for.
+        regex (bool): If True then `phrases` are treated as regular expressions.
+
+    Yields:
+        `usd_searcher.Match`: Every match that was found, as soon as it's found.
+
+    """
+    finder = _get_bytes_finder(phrases, regex)
+    matcher = _get_matcher(phrases, regex)
+
+    for asset in assets:
+        with open(asset, "rb") as handler:
+            if not os.fstat(handler.fileno()).st_size:
+                # Empty files can't be memory-mapped and can't match, anyway
+                continue
+
+            data = mmap.mmap(handler.fileno(), 0, access=mmap.ACCESS_READ)
+
+            try:
+                if not _is_text(data[:_TEXT_SAMPLE_SIZE]):
+                    continue
+
+                for match in _iter_mapped_matches(asset, data, finder, matcher):
+                    yield match
+            finally:
+                data.close()
+
+
+def _iter_layer_matches(layers, matcher, options, timings=None):
+    """Find every match for every given USD Layer.
+
+    Args:
+        layers (iter[`pxr.Sdf.Layer` or str]):
+            The USD Layers to search within or the identifiers of Layers
+            which will be opened before they are searched.
+        matcher (callable[str] -> list[str]): Finds every phrase in a line.
+        options (`usd_searcher.Options`): The settings used to search each Layer.
+        timings (dict[str, float], optional):
+            If given, the seconds spent opening, exporting and matching
+            each Layer are added into this dict.
+
+    Yields:
+        `usd_searcher.Match`: Every match that was found, as soon as it's found.
+
+    """
+    for layer, text in _iter_loaded_layers(layers, options, timings):
+        if options.structured:
+            matches = _iter_spec_matches(layer, matcher)
+        else:
+            matches = _iter_text_matches(layer.realPath, text, matcher)
+
+        for match in _iter_timed(matches, timings, "match"):
+            yield match
+
+
+def _iter_loaded_layers(layers, options, timings):
+    """Open and export every USD Layer that needs to be searched.
+
+    Args:
+        layers (iter[`pxr.Sdf.Layer` or str]): The USD Layers, or their identifiers.
+        options (`usd_searcher.Options`): The settings used to search each Layer.
+        timings (dict[str, float] or NoneType):
+            If given, the seconds spent opening and exporting each Layer
+            are added into this dict.
+
+    Yields:
+        tuple[`pxr.Sdf.Layer`, str or NoneType]:
+            Each searchable Layer and its text. If `options` is a
+            structured search, the Layer isn't exported and the text is None.
+
+    """
+    jobs = ((layer, options.ignore_binary, options.structured) for layer in layers)
+
+    if options.prefetch > 0:
+        results = _iter_prefetched(_load_layer, jobs, options.prefetch)
+    else:
+        results = (_load_layer(job) for job in jobs)
+
+    for layer, text, open_time, export_time in results:
+        _add_time(timings, "open", open_time)
+        _add_time(timings, "export", export_time)
+
+        if layer is not None:
+            yield (layer, text)
+
+
+def _iter_mapped_matches(path, data, finder, matcher):
+    """Find every line in a memory-mapped file that matches.
+
+    Args:
+        path (str): The absolute path to the file that `data` comes from.
+        data (`mmap.mmap`): The contents of the file at `path`.
+        finder (callable[`mmap.mmap`, int] -> int):
+            A function which returns the position of the next possible
+            match after some offset or -1, if there are no more matches.
+        matcher (callable[str] -> list[str]):
+            A function that finds every phrase in a single line of text.
+
+    Yields:
+        `usd_searcher.Match`:
+            Every matching line. The line number and text of each match
+            is the same as if the file had been read line-by-line, as
+            text, where lines end in "\n" or "\r\n".
+
+    """
+    size = len(data)
+    position = 0
+    row = 0
+    counted = 0
+
+    while position < size:
+        found = finder(data, position)
+
+        if found == -1 or found >= size:
+            return
+
+        start = data.rfind(b"\n", 0, found) + 1
+        end = data.find(b"\n", found)
+        end = size if end == -1 else end + 1
+        text = _decode(data[start:end])
+
+        if text.endswith("\r\n"):
+            # Match universal newlines, like files that are opened as text
+            text = text[:-2] + "\n"
+
+        found = matcher(text)
+
+        if found:
+            row += data[counted:start].count(b"\n")
+            counted = start
+
+            for phrase in found:
+                yield Match(path, row, text, phrase)
+
+        position = end
+
+
+def _iter_matches_in_parallel(layers, assets, options, processes, timings):
+    """Search every USD Layer and Asset path, using a pool of worker processes.
+
+    Args:
+        layers (list[`pxr.Sdf.Layer` or str]): The USD Layers, or their identifiers.
+        assets (list[str]): The absolute paths to Asset files to search within.
+        options (`usd_searcher.Options`): The settings used to search each file.
+        processes (int): The number of worker processes to search with.
+        timings (dict[str, float] or NoneType):
+            If given, the seconds that every worker spent in each stage
+            of the search are added into this dict.
+
+    Yields:
+        `usd_searcher.Match`:
+            Every match that was found by every worker. Matches are
+            yielded as soon as a worker finishes its chunk of files.
+            Anonymous Layers and Layers with unsaved changes are
+            searched in this process, instead.
+
+    """
+    # Each worker gets several, smaller chunks so that one chunk with
+    # unusually large files doesn't hold up the whole search
+    #
+    count = processes * 4
+    saved = []
+    unsaved = []
+
+    for layer in layers:
+        if _is_saved(layer):
+            saved.append(getattr(layer, "identifier", layer))
+        else:
+            unsaved.append(layer)
+
+    jobs = [
+        (_search_layers_job, (chunk, options))
+        for chunk in _get_chunks(saved, count)
+        if chunk
+    ]
+    jobs.extend(
+        (_search_assets_job, (chunk, options))
+        for chunk in _get_chunks(assets, count)
+        if chunk
+    )
+
+    pool = multiprocessing.Pool(processes=processes) if jobs else None
+
+    try:
+        results = pool.imap_unordered(_run_job, jobs) if pool else []
+
+        # Workers re-open Layers from disk, which would lose unsaved changes
+        # and can't find anonymous Layers. So those are searched here,
+        # while the workers run.
+        #
+        matcher = _get_matcher(options.phrases, options.regex)
+
+        for match in _iter_layer_matches(unsaved, matcher, options, timings):
+            yield match
+
+        for matches, job_timings in results:
+            for stage, seconds in job_timings.items():
+                _add_time(timings, stage, seconds)
+
+            for match in matches:
+                yield match
+    finally:
+        # If the caller stopped iterating early, there's no reason to
+        # let the remaining workers finish
+        #
+        if pool is not None:
+            pool.terminate()
+            pool.join()
+
+
+def _iter_prefetched(function, items, count):
+    """Run `function` on each item, `count` items ahead of the caller, using threads.
+
+    While the caller works on one result, the next `count` items are
+    already being processed. This lets slow I/O (e.g. reading files
+    from a network mount) overlap with the caller's work.
+
+    Args:
+        function (callable[object] -> object): The function to run on each item.
+        items (iter[object]): The values to pass to `function`.
+        count (int): The number of items to process ahead of the caller.
+
+    Yields:
+        object: The result of `function` for each item, in the same order as `items`.
+
+    """
+    pool = pool_.ThreadPool(processes=count)
+    pending = collections.deque()
+
+    try:
+        for item in items:
+            pending.append(pool.apply_async(function, (item,)))
+
+            if len(pending) > count:
+                yield pending.popleft().get()
+
+        while pending:
+            yield pending.popleft().get()
+    finally:
+        pool.terminate()
+        pool.join()
+
+
+def _iter_spec_fields(layer, spec):
+    """Find the searchable text of some Sdf spec and every spec underneath it.
+
+    Only names, metadata, relationship targets, attribute connections
+    and string / token / asset attribute values are searched. Other
+    values, like points or transforms, never need to be converted to text.
+
+    Args:
+        layer (`pxr.Sdf.Layer`): The USD Layer that `spec` is defined in.
+        spec (`pxr.Sdf.Spec`): A prim, property or variant spec to search within.
+
+    Yields:
+        tuple[`pxr.Sdf.Path`, str, str]:
+            The path of the spec, the name of the field that is being
+            searched and the field's value, as text.
+
+    """
+    path = spec.path
+
+    if path == Sdf.Path.absoluteRootPath:
+        yield (path, "subLayers", str(list(layer.subLayerPaths)))
+    else:
+        yield (path, "name", spec.name)
+
+    for key in spec.ListInfoKeys():
+        if key not in _IGNORED_INFO_KEYS:
+            yield (path, key, str(spec.GetInfo(key)))
+
+    if isinstance(spec, Sdf.RelationshipSpec):
+        yield (path, "targetPaths", str(spec.targetPathList))
+
+        return
+
+    if isinstance(spec, Sdf.AttributeSpec):
+        yield (path, "connectionPaths", str(spec.connectionPathList))
+
+        if spec.typeName.scalarType not in _STRING_TYPES:
+            return
+
+        if spec.HasInfo("default"):
+            yield (path, "default", str(spec.default))
+
+        for time_code in layer.ListTimeSamplesForPath(path):
+            yield (
+                path,
+                "timeSamples[{time_code}]".format(time_code=time_code),
+                str(layer.QueryTimeSample(path, time_code)),
+            )
+
+        return
+
+    for child in spec.properties.values():
+        for field in _iter_spec_fields(layer, child):
+            yield field
+
+    for variant_set in spec.variantSets.values():
+        for variant in variant_set.variants.values():
+            for field in _iter_spec_fields(layer, variant.primSpec):
+                yield field
+
+    for child in spec.nameChildren.values():
+        for field in _iter_spec_fields(layer, child):
+            yield field
+
+
+def _iter_spec_matches(layer, matcher):
+    """Find every match in the specs of some USD Layer.
+
+    Args:
+        layer (`pxr.Sdf.Layer`): The USD Layer to search within.
+        matcher (callable[str] -> list[str]): Finds every phrase in some text.
+
+    Yields:
+        `usd_searcher.Match`: Every match, using the spec path as its "row".
+
+    """
+    for path, field, text in _iter_spec_fields(layer, layer.pseudoRoot):
+        for phrase in matcher(text):
+            yield Match(
+                layer.realPath,
+                str(path),
+                "{field} = {text}".format(field=field, text=text),
+                phrase,
+            )
+
+
+def _iter_text_matches(path, text, matcher):
+    """Find every line in some text that matches.
+
+    Args:
+        path (str): The absolute path to the file that `text` comes from.
+        text (str): The text to search within.
+        matcher (callable[str] -> list[str]): Finds every phrase in a line.
+
+    Yields:
+        `usd_searcher.Match`: Every matching line.
+
+    """
+    for index, line in enumerate(text.splitlines()):
+        for phrase in matcher(line):
+            yield Match(path, index, line, phrase)
+
+
+def _iter_timed(iterable, timings, stage):
+    """Time how long it takes to get each item from `iterable`.
+
+    Only the time spent inside of `iterable` is counted. Any time spent
+    by the caller, between items, is not.
+
+    Args:
+        iterable (iter[object]): Some values to get and time.
+        timings (dict[str, float] or NoneType):
+            The dict that the time will be added into. If None, nothing is timed.
+        stage (str): The key in `timings` to add the time into.
+
+    Yields:
+        object: Every item from `iterable`.
+
+    """
+    iterator = iter(iterable)
+
+    while True:
+        start = _TIMER()
+
+        try:
+            item = next(iterator)
+        except StopIteration:
+            _add_time(timings, stage, _TIMER() - start)
+
+            return
+
+        _add_time(timings, stage, _TIMER() - start)
+
+        yield item
+
+
+def _join_alternatives(patterns):
+    """str: Combine several regular expressions into one which matches any of them."""
+    if isinstance(patterns[0], bytes):
+        return b"|".join(b"(?:" + pattern + b")" for pattern in patterns)
+
+    return "|".join("(?:{pattern})".format(pattern=pattern) for pattern in patterns)
+
+
+def _load_layer(job):
+    """Open some USD Layer and export it as text, if it needs to be searched.
+
+    Args:
+        job (tuple[`pxr.Sdf.Layer` or str, bool, bool]):
+            The Layer to load (or its identifier), whether binary
+            Layers should be skipped and whether the Layer will be
+            searched as specs instead of as text.
+
+    Returns:
+        tuple[`pxr.Sdf.Layer` or NoneType, str or NoneType, float, float]:
+            The opened Layer (or None, if it's a skipped, binary Layer
+            or it couldn't be opened),
+            its text (or None if it didn't need to be exported) and the
+            seconds spent opening and exporting it.
+
+    """
+    layer, ignore_binary, structured = job
+    start = _TIMER()
+
+    layer = open_layer(layer)
+
+    if not layer:
+        return (None, None, _TIMER() - start, 0.0)
+
+    # Anonymous Layers have no file on-disk to check
+    if ignore_binary and layer.realPath and not istext(layer.realPath):
+        return (None, None, _TIMER() - start, 0.0)
+
+    opened = _TIMER()
+
+    if structured:
+        return (layer, None, opened - start, 0.0)
+
+    text = layer.ExportToString()
+
+    return (layer, text, opened - start, _TIMER() - opened)
+
+
+def _run_job(job):
+    """Run a function + its arguments in a worker process.
+
+    Args:
+        job (tuple[callable, object]): A search function and its only argument.
+
+    Returns:
+        tuple[list[`usd_searcher.Match`], dict[str, float]]:
+            Every match that the function found and how long it took.
+
+    """
+    function, arguments = job
+
+    return function(arguments)
+
+
+def _search_assets_job(job):
+    """Search a chunk of Asset paths in a worker process.
+
+    Args:
+        job (tuple[list[str], `usd_searcher.Options`]):
+            The Asset paths to search and the settings to search them with.
+
+    Returns:
+        tuple[list[`usd_searcher.Match`], dict[str, float]]:
+            Every match that was found and how long it took to find them.
+
+    """
+    assets, options = job
+    timings = {}
+    matches = _iter_asset_matches(assets, options.phrases, options.regex)
+
+    return (list(_iter_timed(matches, timings, "assets")), timings)
+
+
+def _search_layers_job(job):
+    """Search a chunk of USD Layers in a worker process.
+
+    `pxr.Sdf.Layer` objects cannot be sent between processes so the
+    Layers are re-opened in the worker, using their identifiers.
+
+    Args:
+        job (tuple[list[str], `usd_searcher.Options`]):
+            The Layer identifiers to search and the settings to search them with.
+
+    Returns:
+        tuple[list[`usd_searcher.Match`], dict[str, float]]:
+            Every match that was found and how long it took to find them.
+
+    """
+    identifiers, options = job
+    timings = {}
+    matcher = _get_matcher(options.phrases, options.regex)
+
+    return (list(_iter_layer_matches(identifiers, matcher, options, timings)), timings)
+
+
+def get_dependencies(
+    path, include_layers, include_assets, ignore_unresolved, dependency_cache, timings
+):
+    """Find the USD Layers and Asset files that a search of `path` must check.
+
+    Args:
+        path (str): The absolute path to the USD file to search from.
+        include_layers (bool): If False, no USD Layers are returned.
+        include_assets (bool): If False, no Asset files are returned.
+        ignore_unresolved (bool): If False, raise an exception for any unresolved path.
+        dependency_cache (`usd_searcher_cache.DependencyCache` or NoneType):
+            If given, the dependencies are re-used from this cache, if possible.
+        timings (dict[str, float] or NoneType):
+            If given, the seconds spent finding dependencies are added into this dict.
+
+    Raises:
+        ValueError: If `path` doesn't exist or isn't a USD file.
+        UnresolvedFound: If `ignore_unresolved` is False and 1+ unresolved paths are found.
+
+    Returns:
+        tuple[list[`pxr.Sdf.Layer` or str], list[str]]:
+            The found USD Layers and Asset paths. If `dependency_cache`
+            is given, Layers which aren't open yet are returned as
+            identifiers and are only opened once they're searched.
+
+    """
+    if not os.path.isfile(path):
+        raise ValueError('"{path}" does not exist.'.format(path=path))
+
+    if not path.endswith(_EXTENSIONS):
+        raise ValueError('"{path}" is not a valid USD file.'.format(path=path))
+
+    start = _TIMER()
+
+    if dependency_cache is not None:
+        layers, assets, unresolved = dependency_cache.compute(path)
+    else:
+        layers, assets, unresolved = UsdUtils.ComputeAllDependencies(path)
+
+    _add_time(timings, "dependencies", _TIMER() - start)
+
+    if not ignore_unresolved and unresolved:
+        raise UnresolvedFound(
+            'Unresolved paths "{unresolved}" were found. Re-run with ignore_unresolved '
+            "set to True or fix the unresolved paths.".format(unresolved=unresolved),
+            unresolved,
+        )
+
+    layers = list(layers) if include_layers else []
+    assets = list(assets) if include_assets else []
+
+    return (layers, assets)
+
+
+def get_layer_path(layer):
+    """Get the file on-disk of some USD Layer, without opening it.
+
+    Args:
+        layer (`pxr.Sdf.Layer` or str): An opened Layer or the identifier of a Layer.
+
+    Returns:
+        str:
+            The real path of the Layer. If `layer` is an identifier which
+            isn't a file path (e.g. a custom resolver's asset path),
+            an empty string is returned.
+
+    """
+    if isinstance(layer, Sdf.Layer):
+        return layer.realPath
+
+    path = Sdf.Layer.SplitIdentifier(layer)[0]
+
+    if not os.path.isabs(path):
+        return ""
+
+    return path
+
+
+def get_literals(pattern):
+    """Find the text that any match of a regular expression must contain.
+
+    Only the literal characters at the top level of `pattern` are
+    considered. Anything that is optional or has alternatives (e.g.
+    "a?", "[ab]", "a|b") splits up the found literals.
+
+    Args:
+        pattern (str): A regular expression to check.
+
+    Returns:
+        list[str]:
+            Every literal substring in `pattern`. If `pattern` is
+            case-insensitive, nothing is returned because its literals
+            cannot be compared directly.
+
+    """
+    parsed = sre_parse.parse(pattern)
+    state = getattr(parsed, "state", None) or parsed.pattern
+
+    if state.flags & re.IGNORECASE:
+        return []
+
+    literals = []
+    current = []
+
+    for operation, value in parsed:
+        if operation == sre_parse.LITERAL:
+            current.append(chr(value))
+
+            continue
+
+        if current:
+            literals.append("".join(current))
+            current = []
+
+    if current:
+        literals.append("".join(current))
+
+    return literals
+
+
+def get_options(
+    phrase,
+    regex,
+    include_layers,
+    include_assets,
+    ignore_binary,
+    structured,
+    prefetch,
+    processes,
+):
+    """Check the user's search settings and combine them.
+
+    Args:
+        phrase (str or iter[str]): The text to search for.
+        regex (bool): If True then `phrase` is treated as a regular expression.
+        include_layers (bool): If USD Layers will be searched.
+        include_assets (bool): If Asset files will be searched.
+        ignore_binary (bool): If USD crate files will be skipped.
+        structured (bool): If USD Layers are searched as specs instead of as text.
+        prefetch (int): The number of USD Layers to load on background threads.
+        processes (int or NoneType): The number of worker processes. 0 or None means "every CPU core".
+
+    Raises:
+        ValueError:
+            If `include_layers` and `include_assets` are both false, if
+            no phrase is given or if `processes` or `prefetch` is negative.
+
+    Returns:
+        tuple[`usd_searcher.Options`, int]: The search settings and the number of processes.
+
+    """
+    if not include_layers and not include_assets:
+        raise ValueError("`include_layers` and `include_assets` cannot both be False.")
+
+    phrases = _get_phrases(phrase)
+
+    if not phrases:
+        raise ValueError("At least one phrase must be given.")
+
+    if processes is not None and processes < 0:
+        raise ValueError(
+            'Processes "{processes}" cannot be negative.'.format(processes=processes)
+        )
+
+    if not processes:
+        processes = multiprocessing.cpu_count()
+
+    if prefetch < 0:
+        raise ValueError(
+            'Prefetch "{prefetch}" cannot be negative.'.format(prefetch=prefetch)
+        )
+
+    return (Options(phrases, regex, ignore_binary, structured, prefetch), processes)
+
+
+def istext(filename):
+    """Check if the given path is an ASCII-based text file.
+
+    References:
+        https://stackoverflow.com/a/1446870/3626104
+
+    Args:
+        filename (str): The path to a file on-disk.
+
+    Returns:
+        bool: If the file is not binary.
+
+    """
+    with open(filename, "rb") as handler:
+        return _is_text(handler.read(_TEXT_SAMPLE_SIZE))
+
+
+def iter_matches(layers, assets, options, processes, timings=None):
+    """Search every USD Layer and then every Asset path for some phrases.
+
+    Args:
+        layers (list[`pxr.Sdf.Layer` or str]): The USD Layers, or their identifiers.
+        assets (list[str]): The absolute paths to Asset files to search within.
+        options (`usd_searcher.Options`): The settings used to search each file.
+        processes (int): The number of worker processes to search with.
+        timings (dict[str, float], optional):
+            If given, the seconds spent in each stage of the search are
+            added into this dict.
+
+    Yields:
+        `usd_searcher.Match`: Every match that was found, as soon as it's found.
+
+    """
+    if processes > 1:
+        for match in _iter_matches_in_parallel(
+            layers, assets, options, processes, timings
+        ):
+            yield match
+
+        return
+
+    matcher = _get_matcher(options.phrases, options.regex)
+
+    for match in _iter_layer_matches(layers, matcher, options, timings):
+        yield match
+
+    matches = _iter_asset_matches(assets, options.phrases, options.regex)
+
+    for match in _iter_timed(matches, timings, "assets"):
+        yield match
+
+
+def iter_search(
     phrase,
     path,
     regex=False,
@@ -118,11 +1067,29 @@ def search(
     include_assets=False,
     ignore_binary=True,
     ignore_unresolved=True,
+    processes=1,
+    index=None,
+    dependency_cache=None,
+    structured=False,
+    prefetch=0,
+    timings=None,
 ):
-    """Search for some phrase recursively, starting at some USD Layer.
+    """Search for some phrase recursively and yield each match as it is found.
+
+    Unlike :func:`search`, the matches are not collected up-front. Each
+    file is searched only once the previous file's matches have been
+    consumed so callers can stop early, e.g. after the first N matches,
+    without searching the rest of the dependency tree.
+
+    Example:
+        >>> import itertools
+        >>> first = list(itertools.islice(iter_search("foo", "/some/file.usda"), 10))
 
     Args:
-        phrase (str): The text to search for.
+        phrase (str or iter[str]):
+            The text to search for. If several phrases are given, every
+            file is still only searched once and each match's "pattern"
+            is the phrase that matched.
         path (str): The absolute path to USD file to search for.
         regex (bool, optional):
             If True then `phrase` is treated as a regular expression.
@@ -143,56 +1110,195 @@ def search(
             path to a file on-disk then this function will raise an
             exception. If True then this function will continue even if
             there are unresolved paths. Default is True.
+        processes (int, optional):
+            The number of worker processes that will search USD Layers
+            and Asset files. If 1, everything is searched in the current
+            process. If 0 or None, one process is used per-CPU core.
+            The found matches are the same, no matter how many processes
+            are used. But the order that they are yielded in may change.
+            Default is 1.
+        index (`usd_searcher_index.TrigramIndex`, optional):
+            If provided, this index is updated with any new or changed
+            file and then used to skip every file that cannot contain
+            `phrase`. The index is not used for `structured` searches.
+            Default is None.
+        dependency_cache (`usd_searcher_cache.DependencyCache`, optional):
+            If provided, the dependencies of `path` are re-used from
+            this cache, as long as none of them have changed since they
+            were last found. Default is None.
+        structured (bool, optional):
+            If True, USD Layers are searched by walking their Sdf specs
+            directly instead of exporting each Layer to text. Names,
+            metadata, relationship targets, attribute connections and
+            string / token / asset values are searched. Each match's
+            "row" is the path of the spec where it was found instead of
+            a line number. This is much faster for USD crate files.
+            Default is False.
+        prefetch (int, optional):
+            The number of USD Layers to open and export on background
+            threads while the current Layer is being matched. This
+            helps most when files are on slow, network storage. If 0,
+            each Layer is opened and exported only when it's needed.
+            Default is 0.
+        timings (dict[str, float], optional):
+            If given, the seconds spent in each stage of the search are
+            added into this dict as the search runs. See
+            `usd_searcher.Results` for a description of each stage.
 
     Raises:
-        ValueError: If `include_layers` and `include_assets` are both false.
+        ValueError:
+            If `include_layers` and `include_assets` are both false, if
+            no phrase is given or if `processes` or `prefetch` is negative.
         UnresolvedFound: If `ignore_unresolved` is False and 1+ unresolved paths are found.
 
     Returns:
-        set[`usd_searcher.Match`]:
+        iter[`usd_searcher.Match`]:
             Every match that was found, the line it was found in, its
             line number, and the full path to the file where the match
             was found.
 
     """
+    options, processes = get_options(
+        phrase,
+        regex,
+        include_layers,
+        include_assets,
+        ignore_binary,
+        structured,
+        prefetch,
+        processes,
+    )
 
-    def _default_matcher(phrase, line):
-        return phrase in line
+    layers, assets = get_dependencies(
+        path,
+        include_layers,
+        include_assets,
+        ignore_unresolved,
+        dependency_cache,
+        timings,
+    )
 
-    if not include_layers and not include_assets:
-        raise ValueError("`include_layers` and `include_assets` cannot both be False.")
+    # Structured searches match spec fields, not exported text, so the
+    # trigrams of each file's text can't tell which files to skip
+    #
+    if index is not None and not structured:
+        start = _TIMER()
+        layers, assets = index.get_candidates(
+            layers, assets, options.phrases, regex=regex, ignore_binary=ignore_binary
+        )
+        _add_time(timings, "index", _TIMER() - start)
 
-    if not os.path.isfile(path):
-        raise ValueError('"{path}" does not exist.'.format(path=path))
+    return iter_matches(layers, assets, options, processes, timings=timings)
 
-    if not path.endswith(_EXTENSIONS):
-        raise ValueError('"{path}" is not a valid USD file.'.format(path=path))
 
-    if regex:
-        matcher = re.compile(phrase).search
-    else:
-        matcher = functools.partial(_default_matcher, phrase)
+def open_layer(layer):
+    """`pxr.Sdf.Layer` or NoneType: Open a Layer from its identifier, if it isn't open already."""
+    if isinstance(layer, Sdf.Layer):
+        return layer
 
-    layers, assets, unresolved = UsdUtils.ComputeAllDependencies(path)
+    return Sdf.Layer.FindOrOpen(layer)
 
-    if not ignore_unresolved and unresolved:
-        raise UnresolvedFound(
-            'Unresolved paths "{unresolved}" were found. Re-run with ignore_unresolved '
-            "set to True or fix the unresolved paths.".format(unresolved=unresolved),
-            unresolved,
-        )
 
-    matches = set()
+def search(
+    phrase,
+    path,
+    regex=False,
+    include_layers=True,
+    include_assets=False,
+    ignore_binary=True,
+    ignore_unresolved=True,
+    processes=1,
+    index=None,
+    dependency_cache=None,
+    structured=False,
+    prefetch=0,
+):
+    """Search for some phrase recursively, starting at some USD Layer.
 
-    if ignore_binary:
-        layers = [layer for layer in layers if istext(layer.realPath)]
+    Args:
+        phrase (str or iter[str]):
+            The text to search for. If several phrases are given, every
+            file is still only searched once and each match's "pattern"
+            is the phrase that matched.
+        path (str): The absolute path to USD file to search for.
+        regex (bool, optional):
+            If True then `phrase` is treated as a regular expression.
+            If False then `phrase` is treated as a substring of each line
+            and searched that way, instead. Default is False.
+        include_layers (bool, optional):
+            If True, search for the phrase in USD Layers. If False,
+            exclude USD Layers from search results. Default is True.
+        include_assets (bool, optional):
+            If True, search for the phrase in all Asset paths. If False,
+            don't search any Asset paths. Default is False.
+        ignore_binary (bool, optional):
+            If True then USD crate files and any other binary Asset
+            resource will not be included in results. If False then
+            binary files will be searched for, instead. Default is True.
+        ignore_unresolved (bool, optional):
+            If False and this function cannot resolve a USD Layer
+            path to a file on-disk then this function will raise an
+            exception. If True then this function will continue even if
+            there are unresolved paths. Default is True.
+        processes (int, optional):
+            The number of worker processes that will search USD Layers
+            and Asset files. If 1, everything is searched in the current
+            process. If 0 or None, one process is used per-CPU core.
+            The found matches are the same, no matter how many processes
+            are used. Default is 1.
+        index (`usd_searcher_index.TrigramIndex`, optional):
+            If provided, this index is updated with any new or changed
+            file and then used to skip every file that cannot contain
+            `phrase`. The index is not used for `structured` searches.
+            Default is None.
+        dependency_cache (`usd_searcher_cache.DependencyCache`, optional):
+            If provided, the dependencies of `path` are re-used from
+            this cache, as long as none of them have changed since they
+            were last found. Default is None.
+        structured (bool, optional):
+            If True, USD Layers are searched by walking their Sdf specs
+            directly instead of exporting each Layer to text. Names,
+            metadata, relationship targets, attribute connections and
+            string / token / asset values are searched. Each match's
+            "row" is the path of the spec where it was found instead of
+            a line number. This is much faster for USD crate files.
+            Default is False.
+        prefetch (int, optional):
+            The number of USD Layers to open and export on background
+            threads while the current Layer is being matched. This
+            helps most when files are on slow, network storage. If 0,
+            each Layer is opened and exported only when it's needed.
+            Default is 0.
 
-    assets = [asset for asset in assets if istext(asset)]
+    Raises:
+        ValueError:
+            If `include_layers` and `include_assets` are both false, if
+            no phrase is given or if `processes` or `prefetch` is negative.
+        UnresolvedFound: If `ignore_unresolved` is False and 1+ unresolved paths are found.
 
-    if include_layers:
-        matches.update(_search_layers(layers, matcher))
+    Returns:
+        `usd_searcher.Results`:
+            Every match that was found, the line it was found in, its
+            line number, and the full path to the file where the match
+            was found. The time spent in each stage of the search is
+            stored in its `timings` attribute.
 
-    if include_assets:
-        matches.update(_search_assets(assets, matcher))
+    """
+    timings = {}
+    matches = iter_search(
+        phrase,
+        path,
+        regex=regex,
+        include_layers=include_layers,
+        include_assets=include_assets,
+        ignore_binary=ignore_binary,
+        ignore_unresolved=ignore_unresolved,
+        processes=processes,
+        index=index,
+        dependency_cache=dependency_cache,
+        structured=structured,
+        prefetch=prefetch,
+        timings=timings,
+    )
 
-    return matches
+    return Results(matches, timings=timings)
@@ -0,0 +1,313 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""Time `usd_searcher.search` against synthetic USD dependency trees.
+
+A tree of USD Layers is generated in a temporary directory. Every Layer
+references 1+ Layers "below" it, some Layers are written as USD crate
+files and some Layers point to text Asset files. Then `usd_searcher.search`
+is run using every combination of its main options and each search is
+timed.
+
+The results are JSON so that they can be saved and compared between
+versions of `usd_searcher`.
+
+Example:
+    >>> import usd_searcher_benchmark
+    >>> report = usd_searcher_benchmark.run(layers=200, depth=4, prims=100)
+    >>> print(report["results"][0]["best"])
+
+"""
+
+# IMPORT STANDARD LIBRARIES
+import itertools
+import os
+import platform
+import random
+import shutil
+import tempfile
+import timeit
+
+# IMPORT THIRD-PARTY LIBRARIES
+from pxr import Sdf, Usd
+
+# IMPORT LOCAL LIBRARIES
+import usd_searcher
+
+PHRASE = "needle"
+_REGEX = r"need+le_\d+"
+_VERSION = 1
+
+
+def _get_levels(layers, depth):
+    """Split a number of Layers into `depth` levels, below a single root Layer.
+
+    Args:
+        layers (int): The total number of Layers, including the root Layer.
+        depth (int): The number of levels underneath the root Layer.
+
+    Returns:
+        list[list[int]]: The indices of the Layers in each level. The first level is the root.
+
+    """
+    levels = [[0]]
+    remaining = list(range(1, layers))
+
+    for level in range(depth):
+        count = len(remaining) // (depth - level)
+        levels.append(remaining[:count])
+        remaining = remaining[count:]
+
+    return [level for level in levels if level]
+
+
+def _time_search(root, options, repeat):
+    """Time `usd_searcher.search` with some options.
+
+    Args:
+        root (str): The absolute path to the USD Layer to search from.
+        options (dict[str, object]): The keyword arguments to search with.
+        repeat (int): The number of times to run the search.
+
+    Returns:
+        dict[str, object]: The options, the time of every search and the number of matches.
+
+    """
+    phrase = _REGEX if options.get("regex") else PHRASE
+    seconds = []
+    stages = {}
+    matches = None
+
+    for _ in range(repeat):
+        start = timeit.default_timer()
+        found = usd_searcher.search(phrase, root, **options)
+        seconds.append(timeit.default_timer() - start)
+        matches = len(found)
+
+        for stage, stage_seconds in found.timings.items():
+            stages[stage] = stages.get(stage, 0.0) + stage_seconds / repeat
+
+    return {
+        "options": options,
+        "seconds": seconds,
+        "best": min(seconds),
+        "mean": sum(seconds) / len(seconds),
+        "matches": matches,
+        "stages": stages,
+    }
+
+
+def _write_asset(path, lines, generator):
+    """Write a text Asset file which contains `PHRASE`, sometimes."""
+    with open(path, "w") as handler:
+        for index in range(lines):
+            if generator.random() < 0.01:
+                handler.write("{phrase}_{index} = 1\n".format(phrase=PHRASE, index=index))
+            else:
+                handler.write("value_{index} = {index}\n".format(index=index))
+
+
+def _write_layer(path, prims, references, asset, generator):
+    """Write a single USD Layer.
+
+    Args:
+        path (str): The absolute path on-disk to write the Layer to.
+        prims (int): The number of extra Prims to add, to make the Layer larger.
+        references (list[str]): The paths to other Layers to reference.
+        asset (str or NoneType): If given, an asset path attribute pointing to this file is added.
+        generator (`random.Random`): Decides which Prims contain the searched phrase.
+
+    """
+    layer = Sdf.Layer.CreateNew(path)
+
+    with Sdf.ChangeBlock():
+        root = Sdf.CreatePrimInLayer(layer, "/Root")
+        root.specifier = Sdf.SpecifierDef
+        root.typeName = "Xform"
+        layer.defaultPrim = "Root"
+
+        for index, reference in enumerate(references):
+            child = Sdf.CreatePrimInLayer(
+                layer, "/Root/Child{index}".format(index=index)
+            )
+            child.specifier = Sdf.SpecifierDef
+            child.referenceList.Prepend(
+                Sdf.Reference(os.path.relpath(reference, os.path.dirname(path)))
+            )
+
+        if asset:
+            attribute = Sdf.AttributeSpec(root, "sidecar", Sdf.ValueTypeNames.Asset)
+            attribute.default = Sdf.AssetPath(
+                os.path.relpath(asset, os.path.dirname(path))
+            )
+
+        for index in range(prims):
+            prim = Sdf.CreatePrimInLayer(
+                layer, "/Root/Geometry/Prim{index}".format(index=index)
+            )
+            prim.specifier = Sdf.SpecifierDef
+            attribute = Sdf.AttributeSpec(prim, "label", Sdf.ValueTypeNames.String)
+
+            if generator.random() < 0.01:
+                attribute.default = "{phrase}_{index}".format(phrase=PHRASE, index=index)
+            else:
+                attribute.default = "label_{index}".format(index=index)
+
+    layer.Save()
+
+
+def create_tree(
+    directory, layers=100, depth=3, prims=100, binary_ratio=0.25, assets=0.25, seed=0
+):
+    """Write a synthetic tree of USD Layers to-disk.
+
+    Args:
+        directory (str): The folder where every file will be written.
+        layers (int, optional): The total number of Layers to write. Default: 100.
+        depth (int, optional): The number of levels of references below the root. Default: 3.
+        prims (int, optional):
+            The number of Prims in each Layer. This controls how large each file is.
+            Default: 100.
+        binary_ratio (float, optional):
+            The fraction of Layers (0-1) which are written as USD crate files. Default: 0.25.
+        assets (float, optional):
+            The fraction of Layers (0-1) which point to a text Asset file. Default: 0.25.
+        seed (int, optional):
+            The value used to randomize the tree. The same seed always
+            creates the same tree. Default: 0.
+
+    Raises:
+        ValueError: If `layers` or `depth` is less than 1.
+
+    Returns:
+        str: The absolute path to the root USD Layer of the tree.
+
+    """
+    if layers < 1 or depth < 1:
+        raise ValueError(
+            'Layers "{layers}" and depth "{depth}" must be at least 1.'.format(
+                layers=layers, depth=depth
+            )
+        )
+
+    generator = random.Random(seed)
+    paths = {}
+
+    for index in range(layers):
+        extension = ".usda"
+
+        if index and generator.random() < binary_ratio:
+            extension = ".usdc"
+
+        paths[index] = os.path.join(
+            directory, "layer_{index}{extension}".format(index=index, extension=extension)
+        )
+
+    levels = _get_levels(layers, depth)
+    children = dict((index, []) for index in range(layers))
+
+    for parents, level in zip(levels, levels[1:]):
+        for index in level:
+            children[generator.choice(parents)].append(paths[index])
+
+    for index in range(layers):
+        asset = None
+
+        if generator.random() < assets:
+            asset = os.path.join(directory, "asset_{index}.txt".format(index=index))
+            _write_asset(asset, prims, generator)
+
+        _write_layer(paths[index], prims, children[index], asset, generator)
+
+    return paths[0]
+
+
+def run(
+    layers=100,
+    depth=3,
+    prims=100,
+    binary_ratio=0.25,
+    assets=0.25,
+    repeat=3,
+    seed=0,
+    search_options=None,
+    directory=None,
+):
+    """Generate a synthetic USD tree and time every combination of search options.
+
+    Args:
+        layers (int, optional): The total number of Layers to write. Default: 100.
+        depth (int, optional): The number of levels of references below the root. Default: 3.
+        prims (int, optional): The number of Prims in each Layer. Default: 100.
+        binary_ratio (float, optional):
+            The fraction of Layers (0-1) which are written as USD crate files. Default: 0.25.
+        assets (float, optional):
+            The fraction of Layers (0-1) which point to a text Asset file. Default: 0.25.
+        repeat (int, optional): The number of times that each search is timed. Default: 3.
+        seed (int, optional): The value used to randomize the tree. Default: 0.
+        search_options (dict[str, object], optional):
+            Extra keyword arguments that are given to every search, e.g.
+            {"processes": 4}. Default is None.
+        directory (str, optional):
+            The folder to write the tree into. If no folder is given, a
+            temporary folder is created and then deleted, afterwards.
+
+    Returns:
+        dict[str, object]:
+            A JSON-compatible report of the tree's parameters and how
+            long each search took.
+
+    """
+    search_options = search_options or {}
+    temporary = directory is None
+
+    if temporary:
+        directory = tempfile.mkdtemp(suffix="_usd_searcher_benchmark")
+
+    try:
+        root = create_tree(
+            directory,
+            layers=layers,
+            depth=depth,
+            prims=prims,
+            binary_ratio=binary_ratio,
+            assets=assets,
+            seed=seed,
+        )
+        # Open every Layer once so that the first search isn't unfairly slower
+        usd_searcher.search(PHRASE, root)
+
+        results = []
+
+        for regex, include_assets, ignore_binary in itertools.product(
+            (False, True), (False, True), (True, False)
+        ):
+            options = dict(search_options)
+            options.update(
+                {
+                    "regex": regex,
+                    "include_assets": include_assets,
+                    "ignore_binary": ignore_binary,
+                }
+            )
+            results.append(_time_search(root, options, repeat))
+    finally:
+        if temporary:
+            shutil.rmtree(directory)
+
+    return {
+        "version": _VERSION,
+        "platform": platform.platform(),
+        "python": platform.python_version(),
+        "usd": ".".join(str(number) for number in Usd.GetVersion()),
+        "parameters": {
+            "layers": layers,
+            "depth": depth,
+            "prims": prims,
+            "binary_ratio": binary_ratio,
+            "assets": assets,
+            "repeat": repeat,
+            "seed": seed,
+        },
+        "results": results,
+    }
@@ -0,0 +1,280 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""A cache for `pxr.UsdUtils.ComputeAllDependencies` so composition isn't re-walked.
+
+Finding every dependency of a USD file means opening every Layer that
+it refers to, recursively. For deep reference graphs, this is often the
+slowest part of a search.
+
+The cache remembers the dependencies of each root USD file (per-resolver
+context) in-memory and, optionally, on-disk. Each cached result also
+stores the modification time and size of every file that it found. If
+any of those files change, the dependencies are computed again.
+
+Example:
+    >>> import usd_searcher
+    >>> import usd_searcher_cache
+    >>> cache = usd_searcher_cache.DependencyCache(path="/tmp/dependencies.json")
+    >>> usd_searcher.search("foo", "/some/file.usda", dependency_cache=cache)
+
+"""
+
+# IMPORT STANDARD LIBRARIES
+import collections
+import json
+import logging
+import os
+import tempfile
+
+# IMPORT THIRD-PARTY LIBRARIES
+from pxr import Ar, Sdf, UsdUtils
+
+_VERSION = 1
+LOGGER = logging.getLogger(__name__)
+
+
+def _get_context_key(context):
+    """str: Create a description of some resolver context which can be saved to-disk."""
+    try:
+        return context.GetDebugString()
+    except AttributeError:
+        # Older USD versions don't have `GetDebugString`
+        return repr(context)
+
+
+def _get_stamp(path):
+    """list[float, int] or NoneType: Get the modification time and size of some file."""
+    try:
+        status = os.stat(path)
+    except OSError:
+        return None
+
+    return [status.st_mtime, status.st_size]
+
+
+def _get_stamps(layers, assets):
+    """dict[str, list[float, int]]: Get the modification time and size of every file."""
+    paths = [layer.realPath for layer in layers if layer.realPath]
+    paths.extend(assets)
+
+    return {path: _get_stamp(path) for path in paths}
+
+
+def _replace(source, destination):
+    """Move `source` to `destination`, replacing `destination` if it exists."""
+    try:
+        replace = os.replace
+    except AttributeError:  # Python 2
+        # `os.rename` can't replace existing files on Windows
+        if os.name == "nt" and os.path.isfile(destination):
+            os.remove(destination)
+
+        replace = os.rename
+
+    replace(source, destination)
+
+
+class DependencyCache(object):
+    """A LRU cache of the dependencies of root USD files."""
+
+    def __init__(self, path=None, maximum=128):
+        """Create the cache and load any previously-saved results.
+
+        Args:
+            path (str, optional):
+                A JSON file that the cache is saved into. If no path is
+                given then the cache only exists in-memory.
+            maximum (int, optional):
+                The number of root USD files to keep cached results for.
+                When more are added, the least-recently-used results are
+                removed. Default: 128.
+
+        Raises:
+            ValueError: If `maximum` isn't a positive number.
+
+        """
+        super(DependencyCache, self).__init__()
+
+        if maximum < 1:
+            raise ValueError(
+                'Maximum "{maximum}" must be at least 1.'.format(maximum=maximum)
+            )
+
+        self.path = path
+        self.maximum = maximum
+        self._entries = collections.OrderedDict()
+
+        if path and os.path.isfile(path):
+            self._load()
+
+    def _add(self, key, entry):
+        """Add `entry` as the most-recently-used entry and remove any old entries."""
+        self._entries.pop(key, None)
+        self._entries[key] = entry
+
+        while len(self._entries) > self.maximum:
+            self._entries.popitem(last=False)
+
+        if self.path:
+            self.save()
+
+    def _get(self, key, context):
+        """Find the cached result for some key, if it is still up-to-date.
+
+        Args:
+            key (str): The root USD file and resolver context description.
+            context (`pxr.Ar.ResolverContext`): The context to resolve paths with.
+
+        Returns:
+            dict[str, object] or NoneType: The found result, if any.
+
+        """
+        entry = self._entries.get(key)
+
+        if not entry:
+            return None
+
+        changed = [
+            path
+            for path, stamp in entry["stamps"].items()
+            if _get_stamp(path) != stamp
+        ]
+
+        if changed:
+            LOGGER.debug('Paths "%s" changed. Dependencies must be recomputed.', changed)
+            self._reload(changed)
+
+            return None
+
+        if entry["unresolved"]:
+            resolver = Ar.GetResolver()
+
+            with Ar.ResolverContextBinder(context):
+                # A file may have been created for a previously-unresolved path
+                if any(resolver.Resolve(path) for path in entry["unresolved"]):
+                    return None
+
+        self._entries.pop(key)
+        self._entries[key] = entry
+
+        return entry
+
+    def _load(self):
+        """Read the cached results from-disk. Unreadable caches are ignored."""
+        try:
+            with open(self.path, "r") as handler:
+                data = json.load(handler)
+        except (IOError, ValueError):
+            LOGGER.warning('Cache "%s" could not be read. It will be rebuilt.', self.path)
+
+            return
+
+        if data.get("version") != _VERSION:
+            LOGGER.info('Cache "%s" is out of date. It will be rebuilt.', self.path)
+
+            return
+
+        for key, entry in data["entries"][-self.maximum :]:
+            self._entries[key] = entry
+
+    @staticmethod
+    def _reload(paths):
+        """Reload any of `paths` which are still open so they don't return stale data.
+
+        Layers with unsaved changes are never reloaded because
+        reloading would throw those changes away.
+
+        """
+        for path in paths:
+            layer = Sdf.Layer.Find(path)
+
+            if layer and not layer.dirty:
+                layer.Reload()
+
+    def clear(self):
+        """Remove every cached result."""
+        self._entries.clear()
+
+        if self.path:
+            self.save()
+
+    def compute(self, path, context=None):
+        """Find every dependency of some USD file, using a cached result if possible.
+
+        Args:
+            path (str): The absolute path to a USD file.
+            context (`pxr.Ar.ResolverContext`, optional):
+                The context used to resolve the dependencies of `path`.
+                If no context is given, the resolver's default context
+                for `path` is used.
+
+        Returns:
+            tuple[list[`pxr.Sdf.Layer` or str], list[str], list[str]]:
+                Every USD Layer, Asset path and unresolved path. This is
+                the same as `pxr.UsdUtils.ComputeAllDependencies` except
+                that, for cached results, any Layer which isn't open
+                yet is returned as its identifier instead of being opened.
+
+        """
+        path = os.path.abspath(path)
+
+        if context is None:
+            context = Ar.GetResolver().CreateDefaultContextForAsset(path)
+
+        key = "{path}\n{context}".format(path=path, context=_get_context_key(context))
+        entry = self._get(key, context)
+
+        if entry:
+            # Opening every Layer again is what this cache avoids. Layers
+            # that aren't open yet are opened later, only if they're searched
+            #
+            layers = [
+                Sdf.Layer.Find(identifier) or identifier
+                for identifier in entry["layers"]
+            ]
+
+            return (layers, list(entry["assets"]), list(entry["unresolved"]))
+
+        with Ar.ResolverContextBinder(context):
+            layers, assets, unresolved = UsdUtils.ComputeAllDependencies(path)
+
+        layers = list(layers)
+        assets = list(assets)
+        unresolved = list(unresolved)
+
+        self._add(
+            key,
+            {
+                "assets": assets,
+                "layers": [layer.identifier for layer in layers],
+                "stamps": _get_stamps(layers, assets),
+                "unresolved": unresolved,
+            },
+        )
+
+        return (layers, assets, unresolved)
+
+    def save(self):
+        """Write every cached result to-disk.
+
+        Raises:
+            RuntimeError: If this cache was created without a path.
+
+        """
+        if not self.path:
+            raise RuntimeError("This cache has no path and cannot be saved.")
+
+        directory = os.path.dirname(os.path.abspath(self.path))
+
+        if not os.path.isdir(directory):
+            os.makedirs(directory)
+
+        handle, temporary = tempfile.mkstemp(dir=directory, suffix=".tmp")
+
+        with os.fdopen(handle, "w") as handler:
+            json.dump(
+                {"version": _VERSION, "entries": list(self._entries.items())}, handler
+            )
+
+        _replace(temporary, self.path)
@@ -0,0 +1,298 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""An on-disk trigram index which lets `usd_searcher` skip files that cannot match.
+
+Every file that `usd_searcher` searches is split into "trigrams" (every
+3-character substring in the file). If a file doesn't contain every
+trigram of the phrase being searched for, the phrase can't be in that
+file and the file doesn't need to be opened.
+
+Files are indexed using their real path, modification time and size
+so that, whenever a file changes, only that one file gets re-indexed.
+
+Example:
+    >>> import usd_searcher
+    >>> import usd_searcher_index
+    >>> index = usd_searcher_index.TrigramIndex("/tmp/show.index")
+    >>> usd_searcher.search("foo", "/some/file.usda", index=index)
+
+"""
+
+# IMPORT STANDARD LIBRARIES
+import logging
+import os
+import pickle
+import tempfile
+
+# IMPORT LOCAL LIBRARIES
+import usd_searcher
+
+_VERSION = 1
+LOGGER = logging.getLogger(__name__)
+
+
+def _get_file_stamp(path):
+    """tuple[float, int] or NoneType: Get the modification time and size of a file."""
+    try:
+        status = os.stat(path)
+    except OSError:
+        return None
+
+    return (status.st_mtime, status.st_size)
+
+
+def _replace(source, destination):
+    """Move `source` to `destination`, replacing `destination` if it exists."""
+    try:
+        replace = os.replace
+    except AttributeError:  # Python 2
+        # `os.rename` can't replace existing files on Windows
+        if os.name == "nt" and os.path.isfile(destination):
+            os.remove(destination)
+
+        replace = os.rename
+
+    replace(source, destination)
+
+
+def get_required_trigrams(phrase, regex=False):
+    """Find the trigrams that every match of some phrase must contain.
+
+    Args:
+        phrase (str): The text to search for.
+        regex (bool, optional):
+            If True then `phrase` is treated as a regular expression.
+            Default is False.
+
+    Returns:
+        set[str]:
+            Every trigram that `phrase` requires. If `phrase` is too
+            short or too loosely defined to have required trigrams, an
+            empty set is returned. An empty set means "anything matches".
+
+    """
+    if not regex:
+        return get_trigrams(phrase)
+
+    trigrams = set()
+
+    for literal in usd_searcher.get_literals(phrase):
+        trigrams.update(get_trigrams(literal))
+
+    return trigrams
+
+
+def get_trigrams(text):
+    """set[str]: Get every unique 3-character substring in `text`."""
+    return set(map("".join, zip(text, text[1:], text[2:])))
+
+
+class TrigramIndex(object):
+    """A persistent index of which trigrams are in which USD Layers and Asset files."""
+
+    def __init__(self, path):
+        """Keep track of the location on-disk where the index will be saved.
+
+        Args:
+            path (str):
+                The file where the index is stored. If the file doesn't
+                exist yet, it will be created the first time this index
+                is updated.
+
+        """
+        super(TrigramIndex, self).__init__()
+
+        self.path = path
+        self._files = None
+
+    def _get_files(self):
+        """dict[str, tuple[float, int, frozenset[str]]]: Load the index, if needed."""
+        if self._files is not None:
+            return self._files
+
+        self._files = {}
+
+        if not os.path.isfile(self.path):
+            return self._files
+
+        try:
+            with open(self.path, "rb") as handler:
+                data = pickle.load(handler)
+        except (EOFError, IOError, pickle.UnpicklingError):
+            LOGGER.warning('Index "%s" could not be read. It will be rebuilt.', self.path)
+
+            return self._files
+
+        if data.get("version") != _VERSION:
+            LOGGER.info('Index "%s" is out of date. It will be rebuilt.', self.path)
+
+            return self._files
+
+        self._files = data["files"]
+
+        return self._files
+
+    def _update_file(self, path, reader):
+        """Re-index `path` if it has changed since it was last indexed.
+
+        Args:
+            path (str): The absolute path to some file on-disk.
+            reader (callable[] -> str or NoneType):
+                A function that gets the searchable text of `path`. If
+                the function returns None, `path` is considered unsearchable.
+
+        Returns:
+            bool: If `path` was re-indexed or removed from the index.
+
+        """
+        files = self._get_files()
+        stamp = _get_file_stamp(path)
+
+        if stamp is None:
+            # A missing file is treated as changed. Unindexed files are always searched
+            return files.pop(path, None) is not None
+
+        existing = files.get(path)
+
+        if existing and existing[:2] == stamp:
+            return False
+
+        text = reader()
+        trigrams = frozenset(get_trigrams(text)) if text is not None else None
+        files[path] = (stamp[0], stamp[1], trigrams)
+
+        return True
+
+    def _is_candidate(self, path, required):
+        """Check if the indexed file `path` might match any phrase.
+
+        Args:
+            path (str): The absolute path to some indexed file.
+            required (list[set[str]]): The trigrams that each phrase requires.
+
+        Returns:
+            bool: If `path` contains every trigram of at least one phrase.
+
+        """
+        try:
+            found = self._get_files()[path][2]
+        except KeyError:
+            return True
+
+        if found is None:
+            return False
+
+        return any(trigrams.issubset(found) for trigrams in required)
+
+    def get_candidates(self, layers, assets, phrase, regex=False, ignore_binary=True):
+        """Update this index and use it to find the files that could match `phrase`.
+
+        Any file which has not been indexed or which has changed since
+        it was last indexed is re-indexed before it is checked.
+
+        Args:
+            layers (list[`pxr.Sdf.Layer` or str]): The USD Layers, or their identifiers.
+            assets (list[str]): The absolute paths to Asset files to check.
+            phrase (str or iter[str]):
+                The text to search for. If several phrases are given,
+                any file that could contain any of them is returned.
+            regex (bool, optional):
+                If True then `phrase` is treated as a regular expression.
+                Default is False.
+            ignore_binary (bool, optional):
+                If True then USD crate Layers are skipped without being
+                exported or indexed, because they won't be searched.
+                Default is True.
+
+        Returns:
+            tuple[list[`pxr.Sdf.Layer` or str], list[str]]:
+                The USD Layers and Asset files which may contain `phrase`.
+                Every other file definitely does not contain `phrase`.
+
+        """
+
+        def _read_asset(path):
+            if not usd_searcher.istext(path):
+                return None
+
+            with open(path, "rb") as handler:
+                return handler.read().decode("utf-8", "replace")
+
+        def _read_layer(layer):
+            layer = usd_searcher.open_layer(layer)
+
+            return layer.ExportToString() if layer else None
+
+        changed = False
+        searchable = []
+
+        for layer in layers:
+            path = usd_searcher.get_layer_path(layer)
+
+            # Layers that have unsaved changes don't match their file
+            # on-disk so they must always be searched
+            #
+            if not path or getattr(layer, "dirty", False) or not os.path.isfile(path):
+                searchable.append((layer, None))
+
+                continue
+
+            # Exporting a crate file is expensive and it would be skipped anyway
+            if ignore_binary and not usd_searcher.istext(path):
+                continue
+
+            searchable.append((layer, path))
+
+            if self._update_file(path, lambda layer=layer: _read_layer(layer)):
+                changed = True
+
+        for asset in assets:
+            if self._update_file(asset, lambda asset=asset: _read_asset(asset)):
+                changed = True
+
+        if changed:
+            self.save()
+
+        if isinstance(phrase, (list, tuple, set, frozenset)):
+            phrases = phrase
+        else:
+            phrases = [phrase]
+
+        required = [get_required_trigrams(phrase_, regex=regex) for phrase_ in phrases]
+
+        if not all(required):
+            # At least one phrase could match anything
+            return ([layer for layer, _ in searchable], list(assets))
+
+        layers = [
+            layer
+            for layer, path in searchable
+            if not path or self._is_candidate(path, required)
+        ]
+        assets = [asset for asset in assets if self._is_candidate(asset, required)]
+
+        return (layers, assets)
+
+    def save(self):
+        """Write this index to-disk.
+
+        The index is written to a temporary file first so that other
+        processes never read a partially-written index.
+
+        """
+        directory = os.path.dirname(os.path.abspath(self.path))
+
+        if not os.path.isdir(directory):
+            os.makedirs(directory)
+
+        handle, temporary = tempfile.mkstemp(dir=directory, suffix=".tmp")
+
+        with os.fdopen(handle, "wb") as handler:
+            pickle.dump(
+                {"version": _VERSION, "files": self._get_files()},
+                handler,
+                protocol=2,
+            )
+
+        _replace(temporary, self.path)
@@ -0,0 +1,356 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""Re-run the same `usd_searcher` search, only re-searching files that changed.
+
+A session remembers the matches of its previous search for every file
+along with a fingerprint of that file (its modification time, size and,
+optionally, a hash of its contents). When the search is run again, only
+files whose fingerprint changed and files which were newly added to the
+dependencies of the root USD file are searched. Every other file re-uses
+its previous matches. If no USD Layer changed, the dependencies of the
+root USD file are re-used, too, instead of being found again.
+
+Example:
+    >>> import usd_searcher_session
+    >>> session = usd_searcher_session.SearchSession("foo", "/some/file.usda")
+    >>> session.search()  # Searches every file
+    >>> session.search()  # Searches nothing, unless a file was changed or added
+    >>> session.changed  # The files that the last search searched
+
+"""
+
+# IMPORT STANDARD LIBRARIES
+import collections
+import hashlib
+import os
+import timeit
+
+# IMPORT THIRD-PARTY LIBRARIES
+from pxr import Sdf
+
+# IMPORT LOCAL LIBRARIES
+import usd_searcher
+
+_HASH_CHUNK_SIZE = 1024 * 1024
+_TIMER = timeit.default_timer
+
+
+def _get_hash(path):
+    """str or NoneType: Hash the contents of some file, if it exists."""
+    digest = hashlib.sha1()
+
+    try:
+        with open(path, "rb") as handler:
+            for chunk in iter(lambda: handler.read(_HASH_CHUNK_SIZE), b""):
+                digest.update(chunk)
+    except (IOError, OSError):
+        return None
+
+    return digest.hexdigest()
+
+
+def _get_stamp(path):
+    """tuple[float, int] or NoneType: Get the modification time and size of some file."""
+    try:
+        status = os.stat(path)
+    except OSError:
+        return None
+
+    return (status.st_mtime, status.st_size)
+
+
+class SearchSession(object):
+    """A search which can be re-run cheaply after a few of its files change.
+
+    The search results of a session are always the same as calling
+    `usd_searcher.search` with the same arguments. The returned
+    `usd_searcher.Results` has an extra "fingerprint" timing, which is
+    the seconds spent checking which files changed.
+
+    Attributes:
+        path (str): The absolute path to USD file to search from.
+        changed (list[str]): The files that were searched by the most recent search.
+
+    """
+
+    def __init__(
+        self,
+        phrase,
+        path,
+        regex=False,
+        include_layers=True,
+        include_assets=False,
+        ignore_binary=True,
+        ignore_unresolved=True,
+        processes=1,
+        dependency_cache=None,
+        structured=False,
+        prefetch=0,
+        use_hash=False,
+    ):
+        """Check and store the settings used for every search.
+
+        Args:
+            phrase (str or iter[str]): The text to search for.
+            path (str): The absolute path to USD file to search from.
+            regex (bool, optional):
+                If True then `phrase` is treated as a regular expression. Default is False.
+            include_layers (bool, optional): If True, search USD Layers. Default is True.
+            include_assets (bool, optional): If True, search Asset files. Default is False.
+            ignore_binary (bool, optional): If True, skip USD crate files. Default is True.
+            ignore_unresolved (bool, optional):
+                If False, searches raise an exception if any path could
+                not be resolved. Default is True.
+            processes (int, optional):
+                The number of worker processes that search the changed
+                files. Default is 1.
+            dependency_cache (`usd_searcher_cache.DependencyCache`, optional):
+                If provided, the dependencies of `path` are re-used from
+                this cache, as long as none of them have changed. A
+                session already re-uses the dependencies of its previous
+                search if no Layer changed so this cache only helps the
+                first search or searches after a Layer changed.
+            structured (bool, optional):
+                If True, USD Layers are searched as specs instead of as text.
+                Default is False.
+            prefetch (int, optional):
+                The number of USD Layers to load ahead of time on
+                background threads. Default is 0.
+            use_hash (bool, optional):
+                If True, a file whose modification time or size changed
+                but whose contents are the same is not searched again.
+                This costs a hash of every new or touched file. Default is False.
+
+        Raises:
+            ValueError:
+                If `include_layers` and `include_assets` are both false, if
+                no phrase is given or if `processes` or `prefetch` is negative.
+
+        """
+        super(SearchSession, self).__init__()
+
+        self._options, self._processes = usd_searcher.get_options(
+            phrase,
+            regex,
+            include_layers,
+            include_assets,
+            ignore_binary,
+            structured,
+            prefetch,
+            processes,
+        )
+        self.path = path
+        self.changed = []
+
+        self._include_layers = include_layers
+        self._include_assets = include_assets
+        self._ignore_unresolved = ignore_unresolved
+        self._dependency_cache = dependency_cache
+        self._use_hash = use_hash
+
+        self._dependencies = None
+        self._fingerprints = {}
+        self._layers = set()
+        self._matches = {}
+
+    def _get_fingerprint(self, path):
+        """Describe the current state of some file and check if it changed.
+
+        Args:
+            path (str): The absolute path to a file on-disk.
+
+        Returns:
+            tuple[tuple[float, int, str or NoneType] or NoneType, bool]:
+                The file's modification time, size and hash (if hashes
+                are enabled) or None, if the file doesn't exist. And
+                whether the file changed since the previous search.
+
+        """
+        stamp = _get_stamp(path)
+
+        if stamp is None:
+            return (None, True)
+
+        previous = self._fingerprints.get(path)
+
+        if previous and previous[:2] == stamp:
+            return (previous, False)
+
+        digest = _get_hash(path) if self._use_hash else None
+        fingerprint = (stamp[0], stamp[1], digest)
+
+        if not previous or digest is None:
+            return (fingerprint, True)
+
+        return (fingerprint, digest != previous[2])
+
+    def _get_previous_fingerprints(self):
+        """Fingerprint every file from the previous search and reload any changed Layer.
+
+        Changed Layers must be reloaded before the dependencies of
+        `path` are found because their new contents may add or remove
+        dependencies.
+
+        Returns:
+            dict[str, tuple[tuple[float, int, str or NoneType], bool]]:
+                Every file from the previous search which still exists,
+                its new fingerprint and if it changed.
+
+        """
+        fingerprints = {}
+
+        for path in self._fingerprints:
+            fingerprint, changed = self._get_fingerprint(path)
+
+            if changed and path in self._layers:
+                layer = Sdf.Layer.Find(path)
+
+                # Reloading would throw away any unsaved changes
+                if layer and not layer.dirty:
+                    layer.Reload()
+
+            if fingerprint is not None:
+                fingerprints[path] = (fingerprint, changed)
+
+        return fingerprints
+
+    def _is_dependencies_changed(self, previous):
+        """Check if the dependencies of `path` may differ from the previous search.
+
+        Args:
+            previous (dict[str, tuple[tuple[float, int, str or NoneType], bool]]):
+                Every file from the previous search which still exists,
+                its new fingerprint and if it changed.
+
+        Returns:
+            bool: If the dependencies of `path` must be found again.
+
+        """
+        if self._dependencies is None:
+            return True
+
+        layers, _ = self._dependencies
+
+        for layer in layers:
+            path = usd_searcher.get_layer_path(layer)
+
+            # Unsaved changes and in-memory Layers can't be fingerprinted
+            if not path or getattr(layer, "dirty", False):
+                return True
+
+            if path not in previous or previous[path][1]:
+                return True
+
+        return False
+
+    def clear(self):
+        """Forget every previous result so the next search searches every file."""
+        self.changed = []
+        self._dependencies = None
+        self._fingerprints.clear()
+        self._layers.clear()
+        self._matches.clear()
+
+    def search(self):
+        """Search every new or changed file and re-use the matches of every other file.
+
+        Raises:
+            ValueError: If `path` doesn't exist or isn't a USD file.
+            `usd_searcher.UnresolvedFound`:
+                If `ignore_unresolved` is False and 1+ unresolved paths are found.
+
+        Returns:
+            `usd_searcher.Results`: Every match in every file, including unchanged files.
+
+        """
+        timings = {}
+        start = _TIMER()
+        previous = self._get_previous_fingerprints()
+        timings["fingerprint"] = _TIMER() - start
+
+        # Asset files can't add dependencies so they don't need to be checked
+        if self._is_dependencies_changed(previous):
+            self._dependencies = usd_searcher.get_dependencies(
+                self.path,
+                self._include_layers,
+                self._include_assets,
+                self._ignore_unresolved,
+                self._dependency_cache,
+                timings,
+            )
+
+        layers, assets = self._dependencies
+
+        start = _TIMER()
+        fingerprints = {}
+        changed_layers = []
+        changed_assets = []
+
+        for layer in layers:
+            path = usd_searcher.get_layer_path(layer)
+
+            # Unsaved changes and in-memory Layers can't be fingerprinted
+            if not path or getattr(layer, "dirty", False):
+                changed_layers.append(layer)
+
+                continue
+
+            fingerprint, changed = previous.get(path) or self._get_fingerprint(path)
+            fingerprints[path] = fingerprint
+
+            if changed or path not in self._matches:
+                changed_layers.append(layer)
+
+        for asset in assets:
+            fingerprint, changed = previous.get(asset) or self._get_fingerprint(asset)
+            fingerprints[asset] = fingerprint
+
+            if changed or asset not in self._matches:
+                changed_assets.append(asset)
+
+        timings["fingerprint"] += _TIMER() - start
+
+        found = collections.defaultdict(list)
+
+        for match in usd_searcher.iter_matches(
+            changed_layers,
+            changed_assets,
+            self._options,
+            self._processes,
+            timings=timings,
+        ):
+            found[match.path].append(match)
+
+        self.changed = [
+            usd_searcher.get_layer_path(layer) or getattr(layer, "identifier", layer)
+            for layer in changed_layers
+        ]
+        self.changed.extend(changed_assets)
+        searched = set(self.changed)
+
+        matches = {}
+
+        for path in fingerprints:
+            if path in searched:
+                matches[path] = found.pop(path, [])
+            else:
+                matches[path] = self._matches[path]
+
+        self._fingerprints = dict(
+            (path, fingerprint)
+            for path, fingerprint in fingerprints.items()
+            if fingerprint is not None
+        )
+        self._layers = set(
+            path for path in map(usd_searcher.get_layer_path, layers) if path
+        )
+        self._matches = matches
+
+        results = [match for path_matches in matches.values() for match in path_matches]
+
+        # In-memory Layers are never remembered so their matches are only added here
+        for path_matches in found.values():
+            results.extend(path_matches)
+
+        return usd_searcher.Results(results, timings=timings)